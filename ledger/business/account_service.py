@@ -8,16 +8,60 @@ from ledger.db.models import Book, Account
 logger = getLogger(__name__)
 
 
+class AccountNotFound(LookupError):
+    """
+    An account could not be resolved in a book. args are (key, kind); the message is
+    only formatted if the exception is rendered, so "exists?" checks stay cheap.
+    """
+
+    _MESSAGES = {
+        'name': "No account found with name '{}'.",
+        'id': "No account found with id '{}'.",
+        'parent': "Parent account named '{}' not found.",
+    }
+
+    def __init__(self, key, kind: str = 'name'):
+        super().__init__(key, kind)
+
+    def __str__(self):
+        key, kind = self.args
+        return self._MESSAGES[kind].format(key)
+
+
 class AccountService:
     """Book-scoped service for account operations. Use via BookContext."""
 
-    def __init__(self, dal: DAL, book: Book):
+    def __init__(
+        self,
+        dal: DAL,
+        book: Book,
+        name_index: dict[str, Account] | None = None,
+        id_index: dict[int, Account] | None = None,
+    ):
         self._dal = dal
         self._book = book
+        # Lookup caches live as long as the owning BookContext (and its session).
+        # When BookContext prefetches the book's accounts they hold the full set.
+        self._prefetched = name_index is not None
+        self._name_cache: dict[str, Account] = name_index if name_index is not None else {}
+        self._id_cache: dict[int, Account] = id_index if id_index is not None else {}
+
+    def _remember(self, account: Account) -> Account:
+        self._name_cache[account.full_name] = account
+        self._id_cache[account.id] = account
+        return account
 
-    def list_accounts(self):
-        """List all accounts in this book."""
-        return self._dal.list_accounts_for_book(self._book.id)
+    def list_accounts(self, with_splits: bool = False):
+        """List all accounts in this book, optionally with their splits loaded."""
+        if self._prefetched and not with_splits:
+            return list(self._id_cache.values())
+        return self._dal.list_accounts_for_book(self._book.id, with_splits=with_splits)
+
+    def accounts_by_full_name(self) -> dict[str, Account]:
+        """All accounts in this book keyed by full name, loaded with a single query."""
+        if self._prefetched:
+            return dict(self._name_cache)
+        return self._dal.accounts_by_full_name(self._book.id)
 
     def add_account(
         self,
@@ -39,9 +83,12 @@ class AccountService:
             )
             if not parent_acct:
                 logger.error(
-                    f"Parent account '{parent_name}' (code={parent_code}) not found in book '{self._book.name}'"
+                    "Parent account '%s' (code=%s) not found in book '%s'",
+                    parent_name,
+                    parent_code,
+                    self._book.name,
                 )
-                raise Exception(f"Parent account named '{parent_name}' not found.")
+                raise AccountNotFound(parent_name, 'parent')
             parent_id = parent_acct.id
 
         new_acct = self._dal.create_account(
@@ -55,22 +102,91 @@ class AccountService:
             parent_account_id=parent_id,
             full_name=full_name,
         )
-        return new_acct
+        return self._remember(new_acct)
 
-    def lookup_by_name(self, account_name: str) -> Account:
-        """Look up account by full name. Raises Exception if not found."""
+    def add_accounts(self, rows: list[dict]) -> list[Account]:
+        """
+        Add many accounts to this book. Each row takes the keyword arguments of
+        add_account. Parents are resolved with one query and must already exist.
+        """
+        pairs = {(r['parent_code'], r['parent_name']) for r in rows if r.get('parent_name')}
+        parents = self._dal.get_accounts_by_name_pairs_for_book(self._book.id, pairs)
+
+        new_accts = []
+        for r in rows:
+            parent_id = None
+            if r.get('parent_name'):
+                parent_acct = parents.get((r['parent_code'], r['parent_name']))
+                if not parent_acct:
+                    logger.error(
+                        "Parent account '%s' (code=%s) not found in book '%s'",
+                        r['parent_name'],
+                        r['parent_code'],
+                        self._book.name,
+                    )
+                    raise AccountNotFound(r['parent_name'], 'parent')
+                parent_id = parent_acct.id
+            new_accts.append(
+                Account(
+                    book_id=self._book.id,
+                    name=r['acct_name'],
+                    code=r['acct_code'],
+                    acct_type=r['acct_type'],
+                    description=r.get('description'),
+                    hidden=r.get('hidden', False),
+                    placeholder=r.get('placeholder', False),
+                    parent_account_id=parent_id,
+                    full_name=r['full_name'],
+                )
+            )
+        return [self._remember(a) for a in self._dal.create_accounts(new_accts)]
+
+    def lookup_by_names(self, account_names) -> dict[str, Account]:
+        """Look up many accounts by full name. Names not found are omitted from the result."""
+        found = {n: self._name_cache[n] for n in account_names if n in self._name_cache}
+        missing = set(account_names) - found.keys()
+        if missing:
+            for account in self._dal.get_accounts_by_fullnames_for_book(self._book.id, missing):
+                found[account.full_name] = self._remember(account)
+        return found
+
+    def lookup_by_ids(self, account_ids) -> dict[int, Account]:
+        """Look up many accounts by ID. IDs not found are omitted from the result."""
+        found = {i: self._id_cache[i] for i in account_ids if i in self._id_cache}
+        missing = set(account_ids) - found.keys()
+        if missing:
+            for account in self._dal.get_accounts_by_ids(missing):
+                found[account.id] = self._remember(account)
+        return found
+
+    def find_by_name(self, account_name: str) -> Account | None:
+        """Look up account by full name. Returns None if not found."""
+        if account_name in self._name_cache:
+            return self._name_cache[account_name]
         account = self._dal.get_account_by_fullname_for_book(
             book_id=self._book.id, acct_fullname=account_name
         )
-        if not account:
-            logger.error(f"Account '{account_name}' not found in book '{self._book.name}'")
-            raise Exception(f"No account found with name '{account_name}'.")
+        return self._remember(account) if account else None
+
+    def find_by_id(self, account_id: int) -> Account | None:
+        """Look up account by ID. Returns None if not found."""
+        if account_id in self._id_cache:
+            return self._id_cache[account_id]
+        account = self._dal.get_account(account_id=account_id)
+        return self._remember(account) if account else None
+
+    def lookup_by_name(self, account_name: str) -> Account:
+        """Look up account by full name. Raises AccountNotFound if not found."""
+        account = self.find_by_name(account_name)
+        if account is None:
+            logger.error("Account '%s' not found in book '%s'", account_name, self._book.name)
+            raise AccountNotFound(account_name)
         return account
 
     def lookup_by_id(self, account_id: int) -> Account:
-        """Look up account by ID. Raises Exception if not found."""
-        account = self._dal.get_account(account_id=account_id)
-        if not account:
-            logger.error(f"Account id={account_id} not found")
-            raise Exception(f"No account found with id '{account_id}'.")
+        """Look up account by ID. Raises AccountNotFound if not found."""
+        account = self.find_by_id(account_id)
+        if account is None:
+            logger.error("Account id=%s not found", account_id)
+            raise AccountNotFound(account_id, 'id')
         return account
@@ -1,8 +1,6 @@
 from logging import getLogger
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
+from ledger.business.session_scope import SessionScope
 from ledger.db.data_access import DAL
 
 logger = getLogger(__name__)
@@ -35,26 +33,41 @@ class BaseService:
     """
 
     def __init__(self, session=None):
-        self._external_session = session is not None
-        self.session = session
-        self.data_access = DAL(session=session) if session else None
-        self.db_url = None
-        self.engine = None
-        self.SessionLocal = None
+        self._scope = SessionScope(session=session)
+
+    @property
+    def session(self):
+        return self._scope.session
+
+    @property
+    def data_access(self) -> DAL | None:
+        return self._scope.dal
+
+    @data_access.setter
+    def data_access(self, dal: DAL | None):
+        self._scope.dal = dal
+
+    @property
+    def db_url(self):
+        return self._scope.db_url
+
+    @property
+    def engine(self):
+        return self._scope.engine
+
+    @property
+    def SessionLocal(self):
+        return self._scope.session_factory
 
     def init_with_url(self, db_url):
-        """Initialize the service with a database URL. Creates engine for session creation."""
-        if not self._external_session:
-            self.db_url = db_url
-            self.engine = create_engine(db_url, echo=False)
-            self.SessionLocal = sessionmaker(bind=self.engine)
+        """Initialize the service with a database URL. Uses the shared engine for that URL."""
+        if not self._scope.external:
+            self._scope = SessionScope(db_url=db_url)
         return self
 
     def __enter__(self):
         """Enter context manager. Creates session if not using external session."""
-        if not self._external_session:
-            self.session = self.SessionLocal()
-            self.data_access = DAL(session=self.session)
+        self._scope.enter()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -64,40 +77,7 @@ class BaseService:
         If using external session: does nothing (caller manages session lifecycle)
         If using own session: commits/rollbacks and closes session
         """
-        # Don't manage lifecycle for external sessions
-        if self._external_session:
-            logger.debug("External session, skipping cleanup")
-            return False
-
-        logger.debug("Exiting BaseService context")
-        try:
-            if exc_type:
-                # Rollback on any exception
-                if self.session:
-                    self.session.rollback()
-                logger.error(
-                    f"Exception during service operation: {exc_type.__name__}: {exc_value}"
-                )
-            else:
-                # Commit successful operations
-                if self.session:
-                    logger.debug("Committing session")
-                    self.session.commit()
-
-            # Always close the session
-            if self.data_access:
-                logger.debug("Closing data access")
-                self.data_access.close()
-        except Exception as cleanup_error:
-            logger.error(f"Error during session cleanup: {cleanup_error}")
-        finally:
-            # Dispose engine to close all database connections
-            if self.engine:
-                logger.debug("Disposing engine")
-                self.engine.dispose()
-            # Ensure session is cleared
-            self.session = None
-            self.data_access = None
-            self.engine = None
-
+        if exc_type:
+            logger.error(f"Exception during service operation: {exc_type.__name__}: {exc_value}")
+        self._scope.exit(exc_type)
         return False  # Allow exception propagation
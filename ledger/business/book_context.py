@@ -8,20 +8,36 @@ Usage:
         ctx.transactions.enter_transaction(...)
 """
 from logging import getLogger
+import time
+from typing import Callable
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import make_transient_to_detached
 
 from ledger.db.data_access import DAL
+from ledger.db.engine import is_memory_sqlite
 from ledger.db.models import Book
 
 from ledger.business.account_service import AccountService
 from ledger.business.transaction_service import TransactionService
 from ledger.business.statement_service import StatementService
 from ledger.business.reconciliation_service import ReconciliationService
+from ledger.business.session_scope import SessionScope
 
 logger = getLogger(__name__)
 
+# Resolved books keyed by (db_url, book_name) -> (resolved_at, book_id). Entries expire after
+# BOOK_CACHE_TTL seconds so a book recreated by another process is picked up again. In-memory
+# SQLite URLs are never cached: each engine on one is a different database.
+BOOK_CACHE_TTL = 60.0
+_BOOK_CACHE: dict[tuple[str, str], tuple[float, int]] = {}
+
+_NOT_ENTERED = "BookContext not entered - use 'with' statement"
+
+
+def clear_book_cache():
+    """Forget all resolved books, e.g. after the schema has been reset."""
+    _BOOK_CACHE.clear()
+
 
 class BookContext:
     """Coordinator for book-scoped services with shared session and auto commit/rollback."""
@@ -29,8 +45,7 @@ class BookContext:
     def __init__(self, book_name: str, db_url: str):
         self.book_name = book_name
         self.db_url = db_url
-        self._engine = create_engine(db_url, echo=False)
-        self._session_factory = sessionmaker(bind=self._engine)
+        self._scope = SessionScope(db_url=db_url)
         self._session = None
         self._dal = None
         self._book = None
@@ -38,82 +53,122 @@ class BookContext:
         self._transactions = None
         self._statements = None
         self._reconciliation = None
+        self._before_commit: list[Callable[[], None]] = []
 
     def __enter__(self):
         logger.debug(f"Entering BookContext for book '{self.book_name}'")
-        self._session = self._session_factory()
-        self._dal = DAL(session=self._session)
+        self._session, self._dal = self._scope.enter()
 
-        self._book = self._dal.get_book_by_name(self.book_name)
+        self._book = self._resolve_book()
         if not self._book:
             logger.error(f"Book '{self.book_name}' not found")
-            self._session.close()
+            self._scope.exit(ValueError)
+            self._clear()
             raise ValueError(f"Book '{self.book_name}' not found")
 
         logger.debug(f"Resolved book '{self.book_name}' to id={self._book.id}")
-        self._accounts = AccountService(self._dal, self._book)
-        self._transactions = TransactionService(self._dal, self._book)
-        self._statements = StatementService(self)
-        self._reconciliation = ReconciliationService(self)
-        logger.debug("BookContext services initialized")
-
         return self
 
-    def _require_entered(self, attr):
-        value = getattr(self, f'_{attr}')
-        if value is None:
-            raise RuntimeError("BookContext not entered - use 'with' statement")
-        return value
+    def before_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback when the context exits cleanly, before its transaction commits."""
+        self._before_commit.append(callback)
+
+    def _resolve_book(self) -> Book | None:
+        """Look up the book by name, skipping the SELECT when it was resolved recently."""
+        if is_memory_sqlite(self.db_url):
+            return self._dal.get_book_by_name(self.book_name)
+        key = (self.db_url, self.book_name)
+        cached = _BOOK_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < BOOK_CACHE_TTL:
+            # Attach a detached stand-in carrying the identity; other columns load on access
+            book = Book(id=cached[1], name=self.book_name)
+            make_transient_to_detached(book)
+            self._session.add(book)
+            return book
+
+        book = self._dal.get_book_by_name(self.book_name)
+        if book:
+            _BOOK_CACHE[key] = (time.monotonic(), book.id)
+        else:
+            _BOOK_CACHE.pop(key, None)
+        return book
 
     @property
     def book(self) -> Book:
-        return self._require_entered('book')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        return self._book
 
     @property
     def accounts(self) -> 'AccountService':
-        return self._require_entered('accounts')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        if self._accounts is None:
+            # A book has at most a few hundred accounts; one SELECT replaces per-lookup queries
+            accounts = self._dal.list_accounts_for_book(self._book.id)
+            self._accounts = AccountService(
+                self._dal,
+                self._book,
+                name_index={a.full_name: a for a in accounts},
+                id_index={a.id: a for a in accounts},
+            )
+        return self._accounts
 
     @property
     def transactions(self) -> 'TransactionService':
-        return self._require_entered('transactions')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        if self._transactions is None:
+            self._transactions = TransactionService(self._dal, self._book)
+        return self._transactions
 
     @property
     def dal(self) -> DAL:
         """Get DAL for operations not covered by services (e.g., import files, cache)."""
-        return self._require_entered('dal')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        return self._dal
 
     @property
     def statements(self) -> 'StatementService':
         """Get the statement service for importing and managing account statements."""
-        return self._require_entered('statements')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        if self._statements is None:
+            self._statements = StatementService(self)
+        return self._statements
 
     @property
     def reconciliation(self) -> 'ReconciliationService':
         """Get the reconciliation service for verifying statement balances."""
-        return self._require_entered('reconciliation')
+        if self._session is None:
+            raise RuntimeError(_NOT_ENTERED)
+        if self._reconciliation is None:
+            self._reconciliation = ReconciliationService(self)
+        return self._reconciliation
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         logger.debug(f"Exiting BookContext for book '{self.book_name}'")
         try:
-            if exc_type:
-                logger.debug(f"Exception occurred ({exc_type.__name__}), rolling back")
-                self._session.rollback()
-            else:
-                logger.debug("Committing session")
-                self._session.commit()
+            if exc_type is None:
+                for callback in self._before_commit:
+                    callback()
+        except Exception as e:
+            exc_type = type(e)
+            raise
         finally:
-            if self._session:
-                logger.debug("Closing session")
-                self._session.close()
-            if self._engine:
-                logger.debug("Disposing engine")
-                self._engine.dispose()
-            self._session = None
-            self._dal = None
-            self._book = None
-            self._accounts = None
-            self._transactions = None
-            self._statements = None
-            self._reconciliation = None
-            self._engine = None
+            try:
+                self._scope.exit(exc_type)
+            finally:
+                self._before_commit = []
+                self._clear()
         return False
+
+    def _clear(self):
+        self._session = None
+        self._dal = None
+        self._book = None
+        self._accounts = None
+        self._transactions = None
+        self._statements = None
+        self._reconciliation = None
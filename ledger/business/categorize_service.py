@@ -17,15 +17,47 @@ Usage:
         if result:
             category_name, source = result  # ('Expenses:Food:Groceries', 'rule')
 """
+
 import json
+import os
 import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 from logging import getLogger, warning
 
 from ledger.config import CATEGORY_RULES_PATH
 
+try:
+    import ahocorasick  # pip install ledger[fast-match]
+except ImportError:  # optional; the combined regex covers literal rules too
+    ahocorasick = None
+
 logger = getLogger(__name__)
 from ledger.business.book_context import BookContext
 
+MATCH_CACHE_SIZE = 10_000
+
+_BACKREF_RE = re.compile(r'\\\d|\(\?P=')
+
+
+def _anchored_first_char(pattern: re.Pattern) -> str | None:
+    """
+    The lowercased letter, digit or space a pattern must start the payee with
+    ('^X...'), else None. Read conservatively from the pattern text: any top-level
+    alternation or a quantifier that lets X repeat zero times disqualifies it.
+    """
+    source = pattern.pattern
+    if len(source) < 2 or source[0] != '^' or '|' in source:
+        return None
+    first = source[1]
+    if not (first.isascii() and (first.isalnum() or first == ' ')):
+        return None
+    if source[2:3] in ('*', '?', '{'):
+        return None
+    return first.lower()
+
 
 class CategoryRules:
     """
@@ -45,6 +77,18 @@ class CategoryRules:
         self.rules_path = rules_path
         self.rules: dict[str, list[dict]] = {}
         self._compiled_patterns: dict[str, list[tuple[re.Pattern, str]]] = {}
+        # Flattened rule order; indexes into this list rank matches (lowest wins)
+        self._rule_categories: list[str] = []
+        self._literal_rules: list[tuple[int, str]] = []
+        self._automaton = None
+        # Combined regex for payees whose first character no anchored rule starts with
+        self._combined: re.Pattern | None = None
+        # Group number -> rule index for the marker groups of a combined regex
+        self._group_to_rule: list[int | None] = []
+        # Lowercased first character -> (combined regex, group_to_rule) including anchored rules
+        self._combined_by_first: dict[str, tuple[re.Pattern, list[int | None]]] = {}
+        # Payees recur across imports (recurring merchants); remember each verdict
+        self._match_cached = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._search)
         self._load_rules()
 
     def _load_rules(self):
@@ -79,6 +123,10 @@ class CategoryRules:
                     except re.error as e:
                         logger.debug(f"_load_rules: invalid literal '{payee}' for {category}: {e}")
                         continue
+                    # ASCII literals only: lower() folds them exactly as IGNORECASE does
+                    if payee and payee.isascii():
+                        self._literal_rules.append((len(self._rule_categories), payee))
+                self._rule_categories.append(category)
 
             if compiled:
                 self._compiled_patterns[category] = compiled
@@ -87,6 +135,88 @@ class CategoryRules:
         logger.debug(
             f"_load_rules: loaded {len(self._compiled_patterns)} categories with {total_patterns} patterns"
         )
+        self._build_matchers()
+
+    def _build_matchers(self):
+        """
+        Build the matchers that let match() classify a payee in one scan per kind.
+
+        With pyahocorasick installed, ASCII literal rules go into an Aho-Corasick
+        automaton and the remaining rules are combined; otherwise every rule is
+        combined.
+        Regex rules anchored on a literal first character (e.g. '^TRADER JOE') can
+        only match payees starting with it, so they are left out of the combined
+        regex used for other first characters. All matchers report rule indexes, and
+        match() takes the lowest, so the first rule in file order wins exactly as
+        with the per-pattern loop.
+        """
+        patterns = [p for compiled in self._compiled_patterns.values() for p, _ in compiled]
+        literal_indexes = set()
+        if ahocorasick is not None and self._literal_rules:
+            automaton = ahocorasick.Automaton()
+            for index, literal in self._literal_rules:
+                # Keep the earliest rule for a literal listed more than once
+                if literal.lower() not in automaton:
+                    automaton.add_word(literal.lower(), index)
+                literal_indexes.add(index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+        regex_rules = [
+            (i, p, _anchored_first_char(p))
+            for i, p in enumerate(patterns)
+            if i not in literal_indexes
+        ]
+        residual = self._build_combined([r for r in regex_rules if r[2] is None])
+        by_first = {}
+        for first in {r[2] for r in regex_rules} - {None}:
+            rules = [r for r in regex_rules if r[2] in (None, first)]
+            by_first[first] = self._build_combined(rules)
+        if residual is None or None in by_first.values():
+            # Fall back to the per-pattern loop for every rule
+            self._automaton = None
+            return
+        self._combined, self._group_to_rule = residual
+        self._combined_by_first = by_first
+
+    @staticmethod
+    def _build_combined(
+        indexed_patterns: list[tuple[int, re.Pattern, str | None]],
+    ) -> tuple[re.Pattern | None, list[int | None]] | None:
+        """
+        Fold patterns into one alternation so the regex tier is a single search.
+
+        Each alternative is anchored at the start and scans forward with a lazy .*?
+        (unless the pattern is itself anchored), so the regex engine tries patterns
+        in rule order and the first pattern that matches anywhere wins. An empty
+        marker group after each pattern is the last group to close when that pattern
+        matches, so match.lastindex identifies it. Returns the combined pattern and a
+        list mapping group numbers to rule indexes (None for the patterns' own
+        groups), or None when the patterns can't be combined.
+        """
+        alternatives = []
+        rules = []
+        for index, pattern, first in indexed_patterns:
+            if _BACKREF_RE.search(pattern.pattern):
+                # Group numbers shift inside the alternation, so backreferences would break
+                logger.debug(f"_build_combined: '{pattern.pattern}' has a backreference")
+                return None
+            scan = '' if first else '.*?'
+            alternatives.append(f"(?:{scan}(?:{pattern.pattern})(?P<c{len(rules)}>))")
+            rules.append(index)
+        if not alternatives:
+            return None, []
+        try:
+            combined = re.compile("^(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+        except re.error as e:
+            # e.g. a pattern defining a group named like one of the markers
+            logger.debug(f"_build_combined: falling back to per-pattern matching: {e}")
+            return None
+        # Markers are named only to locate their group numbers once, here
+        group_to_rule = [None] * (combined.groups + 1)
+        for marker, index in enumerate(rules):
+            group_to_rule[combined.groupindex[f'c{marker}']] = index
+        return combined, group_to_rule
 
     def match(self, payee_norm: str) -> str | None:
         """
@@ -102,10 +232,40 @@ class CategoryRules:
             logger.debug("match: empty payee_norm, returning None")
             return None
 
+        return self._match_cached(payee_norm)
+
+    def _search(self, payee_norm: str) -> str | None:
+        """Scan the rules for payee_norm; match() memoizes the result."""
         logger.debug(
             f"match: searching {len(self._compiled_patterns)} categories for '{payee_norm}'"
         )
 
+        # IGNORECASE also folds a few non-ASCII letters onto ASCII ones (e.g. 'ſ' onto
+        # 's'), which lower() and the first-character buckets don't; such payees take
+        # the per-pattern loop so every path agrees
+        fast = self._automaton is not None or self._combined is not None or self._combined_by_first
+        if fast and payee_norm.isascii():
+            first_rule = None
+            if self._automaton is not None:
+                for _, index in self._automaton.iter(payee_norm.lower()):
+                    if first_rule is None or index < first_rule:
+                        first_rule = index
+            combined, group_to_rule = self._combined_by_first.get(
+                payee_norm[0].lower(), (self._combined, self._group_to_rule)
+            )
+            if combined is not None:
+                m = combined.search(payee_norm)
+                if m is not None:
+                    index = group_to_rule[m.lastindex]
+                    if first_rule is None or index < first_rule:
+                        first_rule = index
+            if first_rule is None:
+                logger.debug(f"match: no pattern matched for '{payee_norm}'")
+                return None
+            category = self._rule_categories[first_rule]
+            logger.debug(f"match: FOUND - category='{category}'")
+            return category
+
         # Check all patterns
         for category, patterns in self._compiled_patterns.items():
             for pattern, cat in patterns:
@@ -123,6 +283,21 @@ class CategoryRules:
         return list(self.rules.keys())
 
 
+@lru_cache(maxsize=8)
+def _load_category_rules(rules_path: str, mtime_ns: int | None) -> CategoryRules:
+    """Load and compile rules once per (path, mtime); editing the file invalidates the entry."""
+    return CategoryRules(rules_path)
+
+
+def get_category_rules(rules_path: str = CATEGORY_RULES_PATH) -> CategoryRules:
+    """Return the shared CategoryRules for rules_path, reloading it if the file changed."""
+    try:
+        mtime_ns = os.stat(rules_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    return _load_category_rules(rules_path, mtime_ns)
+
+
 class CategorizeService:
     """
     Service for looking up categories for transactions based on payee patterns.
@@ -145,7 +320,27 @@ class CategorizeService:
             rules_path: Path to category rules JSON file
         """
         self._ctx = ctx
-        self.rules = CategoryRules(rules_path)
+        self.rules = get_category_rules(rules_path)
+        # Payees that neither the cache nor the rules categorized in this service
+        self._misses: set[str] = set()
+        # payee_norm -> account_id for the whole category cache, loaded on first single lookup
+        self._cache_index: dict[str, int] | None = None
+        # account_id -> {source: (full_name, source)}; one shared result per category
+        self._results: dict[int, dict[str, tuple[str, str]]] = {}
+        # Cache hits are counted here and written in one UPDATE when the context commits
+        self._pending_hits: Counter[str] = Counter()
+        ctx.before_commit(self.flush_cache_hits)
+
+    def _result(self, account, source: str) -> tuple[str, str]:
+        """Return the shared (full_name, source) result for a category account."""
+        results = self._results.get(account.id)
+        if results is None:
+            full_name = sys.intern(account.full_name)
+            results = self._results[account.id] = {
+                'cache': (full_name, 'cache'),
+                'rule': (full_name, 'rule'),
+            }
+        return results[source]
 
     def lookup_category_for_payee(
         self,
@@ -173,28 +368,34 @@ class CategorizeService:
         if not payee_norm:
             logger.debug("lookup_category_for_payee: empty payee_norm, returning None")
             return None
+        if payee_norm in self._misses:
+            logger.debug(f"lookup_category_for_payee: known miss '{payee_norm}', returning None")
+            return None
 
         # Tier 1: Check category cache (use DAL for cache operations)
         logger.debug(f"lookup_category_for_payee: Tier 1 - checking cache for '{payee_norm}'")
-        cache_entry = self._ctx.dal.get_category_from_cache(payee_norm)
-        if cache_entry:
+        if self._cache_index is None:
+            self._cache_index = self._ctx.dal.get_category_cache_map()
             logger.debug(
-                f"lookup_category_for_payee: cache HIT - account_id={cache_entry.account_id}"
+                f"lookup_category_for_payee: loaded {len(self._cache_index)} cache entries"
             )
+        cached_account_id = self._cache_index.get(payee_norm)
+        if cached_account_id:
+            logger.debug(f"lookup_category_for_payee: cache HIT - account_id={cached_account_id}")
             # Use AccountService for account lookup
-            try:
-                category_account = self._ctx.accounts.lookup_by_id(cache_entry.account_id)
+            category_account = self._ctx.accounts.find_by_id(cached_account_id)
+            if category_account is not None:
                 if update_cache:
-                    self._ctx.dal.increment_cache_hit(payee_norm)
+                    self._pending_hits[payee_norm] += 1
                 logger.debug(
                     f"lookup_category_for_payee: returning cached category '{category_account.full_name}'"
                 )
-                return (category_account.full_name, 'cache')
-            except Exception as e:
-                # Account not found, continue to tier 2
-                logger.debug(
-                    f"lookup_category_for_payee: cache entry invalid (account not found: {e}), continuing to Tier 2"
-                )
+                return self._result(category_account, 'cache')
+            # Account not found, continue to tier 2
+            logger.debug(
+                f"lookup_category_for_payee: cache entry invalid "
+                f"(account id={cached_account_id} not found), continuing to Tier 2"
+            )
         else:
             logger.debug("lookup_category_for_payee: cache MISS")
 
@@ -204,28 +405,130 @@ class CategorizeService:
         if matched_category:
             logger.debug(f"lookup_category_for_payee: rule matched category '{matched_category}'")
             # Verify the account exists using AccountService
-            try:
-                category_account = self._ctx.accounts.lookup_by_name(matched_category)
+            category_account = self._ctx.accounts.find_by_name(matched_category)
+            if category_account is not None:
                 if update_cache:
                     # Cache this match for future lookups
                     self._ctx.dal.set_category_cache(payee_norm, category_account.id)
+                    self._cache_index[payee_norm] = category_account.id
                     logger.debug(
                         f"lookup_category_for_payee: cached mapping '{payee_norm}' -> '{matched_category}'"
                     )
                 logger.debug(
                     f"lookup_category_for_payee: returning rule-matched category '{matched_category}'"
                 )
-                return (matched_category, 'rule')
-            except Exception as e:
-                warning(
-                    f"Category {matched_category} found for payee {payee_norm} but account not found"
-                )
-                logger.debug(
-                    f"lookup_category_for_payee: account '{matched_category}' not found: {e}"
-                )
+                return self._result(category_account, 'rule')
+            warning(
+                f"Category {matched_category} found for payee {payee_norm} but account not found"
+            )
 
         # Tier 3: No match - return None, let caller handle fallback
+        if not cached_account_id and not matched_category:
+            self._misses.add(payee_norm)
         logger.debug(
             f"lookup_category_for_payee: Tier 3 - no match found for '{payee_norm}', returning None"
         )
         return None
+
+    def lookup_categories_for_payees(
+        self,
+        payee_norms: list[str],
+        update_cache: bool = True,
+    ) -> dict[str, tuple[str, str]]:
+        """
+        Bulk version of lookup_category_for_payee for a whole import.
+
+        Runs the same tiers with a fixed number of queries regardless of how many
+        payees are given: one cache lookup joined to its accounts, one account lookup
+        for rule matches, and one write for new cache entries. Cache hit counts are
+        buffered like single lookups.
+
+        Args:
+            payee_norms: Normalized payee per transaction (duplicates count as hits)
+            update_cache: Whether to update hit counts and cache rule matches
+
+        Returns:
+            Dict of payee_norm -> (category_account_fullname, source) for payees
+            that were categorized; payees with no category are omitted
+        """
+        occurrences = Counter(p for p in payee_norms if p and p not in self._misses)
+        if not occurrences:
+            return {}
+        logger.debug(f"lookup_categories_for_payees: {len(occurrences)} distinct payees")
+
+        # Tier 1: Category cache
+        cached_accounts = self._ctx.dal.get_cached_category_accounts(self._ctx.book.id, occurrences)
+        results: dict[str, tuple[str, str]] = {}
+        hit_counts: dict[str, int] = {}
+        for payee_norm, account in cached_accounts.items():
+            results[payee_norm] = self._result(account, 'cache')
+            hit_counts[payee_norm] = occurrences[payee_norm]
+        logger.debug(f"lookup_categories_for_payees: {len(results)} cache hits")
+
+        # Tier 2: Regex rules for everything the cache didn't resolve
+        rule_matches = {}
+        for payee_norm in occurrences:
+            if payee_norm in results:
+                continue
+            matched_category = self.rules.match(payee_norm)
+            if matched_category:
+                rule_matches[payee_norm] = matched_category
+            else:
+                self._misses.add(payee_norm)
+        rule_accounts = self._ctx.accounts.lookup_by_names(set(rule_matches.values()))
+        new_cache_rows = []
+        for payee_norm, matched_category in rule_matches.items():
+            account = rule_accounts.get(matched_category)
+            if not account:
+                warning(
+                    f"Category {matched_category} found for payee {payee_norm} but account not found"
+                )
+                continue
+            results[payee_norm] = self._result(account, 'rule')
+            new_cache_rows.append(
+                {
+                    'payee_norm': payee_norm,
+                    'account_id': account.id,
+                    'hit_count': occurrences[payee_norm],
+                }
+            )
+        logger.debug(f"lookup_categories_for_payees: {len(new_cache_rows)} rule matches")
+
+        if update_cache:
+            self._pending_hits.update(hit_counts)
+            self._ctx.dal.set_category_cache_bulk(new_cache_rows)
+            if self._cache_index is not None:
+                self._cache_index.update((r['payee_norm'], r['account_id']) for r in new_cache_rows)
+
+        # Tier 3: Payees left out of results are the caller's to handle
+        return results
+
+    @contextmanager
+    def deferred_writes(self):
+        """
+        Tie the cache writes made in the block to the caller's database transaction.
+
+        Hit counts buffered in the block are written when it exits cleanly, before
+        the enclosing transaction commits. If the block raises they are discarded,
+        and the in-memory cache index and results are dropped (reloaded on next use)
+        since they may hold entries the rollback undid.
+        """
+        outer_hits = self._pending_hits
+        self._pending_hits = Counter()
+        try:
+            yield
+            self.flush_cache_hits()
+        except BaseException:
+            self._cache_index = None
+            self._results = {}
+            raise
+        finally:
+            self._pending_hits = outer_hits
+
+    def flush_cache_hits(self) -> None:
+        """Write buffered cache hit counts with one batched UPDATE."""
+        if not self._pending_hits:
+            return
+        logger.debug(f"flush_cache_hits: updating {len(self._pending_hits)} cache entries")
+        self._ctx.dal.increment_cache_hits(self._pending_hits)
+        self._pending_hits = Counter()
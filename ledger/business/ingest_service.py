@@ -6,21 +6,31 @@ Usage:
     with BookContext("personal", DB_URL) as ctx:
         report = IngestService(ctx).ingest_qif('statement.qif')
 """
+
 import hashlib
+import io
 import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
+from itertools import islice
 from logging import getLogger
 
+from ledger.business.account_service import AccountNotFound
 from ledger.business.book_context import BookContext
 
 logger = getLogger(__name__)
-from ledger.business.matching_service import MatchingService
+from ledger.business.matching_service import MatchingService, date_span
 from ledger.business.categorize_service import CategorizeService
 from ledger.config import CATEGORY_RULES_PATH, UNCATEGORIZED_ACCOUNT, MATCHING_RULES_PATH
 from ledger.util.qif import Qif
 from ledger.db.models import ImportFile
 
+# Upper bound on threads reading files ahead of the ingest; the only threads it starts
+READ_WORKERS_MAX = 8
+
 
 class IngestResult(Enum):
     """Result of an ingest operation."""
@@ -30,7 +40,7 @@ class IngestResult(Enum):
     HASH_MISMATCH = "mismatch"
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestReport:
     """Report from an ingest operation."""
 
@@ -54,20 +64,80 @@ class IngestService:
         self._ctx = ctx
         self.matching_rules = matching_rules
         self.category_rules_path = category_rules_path
+        self._categorize: CategorizeService | None = None
+
+    @property
+    def categorize(self) -> CategorizeService:
+        """CategorizeService shared by every file ingested through this service."""
+        if self._categorize is None:
+            self._categorize = CategorizeService(ctx=self._ctx, rules_path=self.category_rules_path)
+        return self._categorize
 
     def ingest_qif(self, file_path: str) -> IngestReport:
         """Ingest a QIF file. Returns IngestReport with operation details."""
+        file_hash, qif = self._read_qif(file_path)
+        return self._ingest_parsed(file_path, file_hash, qif)
+
+    def ingest_qifs(
+        self, file_paths: list[str], max_workers: int | None = None
+    ) -> Iterator[tuple[str, IngestReport | ValueError]]:
+        """
+        Ingest QIF files in order, yielding (file_path, report) for each.
+
+        Each file is read, hashed and parsed ahead on a single pool of max_workers
+        threads (by default one per CPU; never more than READ_WORKERS_MAX), at most
+        that many files ahead. The pool is shut down when the iterator finishes or is
+        closed. Categorization, matching and inserts stay on the calling thread,
+        which owns the session. A file rejected with ValueError is yielded as
+        (file_path, error) so the remaining files are still ingested.
+        """
+        max_workers = min(max_workers or os.process_cpu_count() or 1, READ_WORKERS_MAX)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='qif-read') as executor:
+            paths = iter(file_paths)
+            pending = deque(
+                (path, executor.submit(self._read_qif, path)) for path in islice(paths, max_workers)
+            )
+            while pending:
+                file_path, read = pending.popleft()
+                for path in islice(paths, 1):
+                    pending.append((path, executor.submit(self._read_qif, path)))
+                try:
+                    yield file_path, self._ingest_parsed(file_path, *read.result())
+                except ValueError as e:
+                    yield file_path, e
+
+    @staticmethod
+    def _read_qif(file_path: str) -> tuple[str, Qif]:
+        """Read a QIF file once, hashing and parsing the same bytes; touches no session."""
         filename = os.path.basename(file_path)
         logger.info(f"Starting ingestion of '{filename}'")
         logger.debug(f"Full path: {file_path}")
 
-        file_hash = self._compute_file_hash(file_path)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        file_hash = hashlib.sha256(data).hexdigest()
         logger.debug(f"File hash: {file_hash[:16]}...")
-        book = self._ctx.book
 
-        # Parse QIF
+        # Parse QIF, decoding as open(file_path, 'r') would
         logger.debug("Parsing QIF file")
-        qif = Qif().init_from_qif_file(file_path)
+        qif = Qif().init_from_qif_data(io.TextIOWrapper(io.BytesIO(data)))
+        return file_hash, qif
+
+    def _ingest_parsed(self, file_path: str, file_hash: str, qif: Qif) -> IngestReport:
+        """
+        Import a parsed QIF file in one database transaction.
+
+        The category cache updates and hit counts, match marks, inserts and the
+        ImportFile record commit together, so a failure part way leaves no partial
+        import behind.
+        """
+        with self._ctx.dal.deferred_commits(), self.categorize.deferred_writes():
+            return self._import_qif(file_path, file_hash, qif)
+
+    def _import_qif(self, file_path: str, file_hash: str, qif: Qif) -> IngestReport:
+        """Categorize, match and insert a parsed QIF file and record the import."""
+        filename = os.path.basename(file_path)
+        book = self._ctx.book
         account_name = qif.account_info.get('N')
         if not account_name:
             logger.error(f"QIF file '{filename}' missing account information")
@@ -78,7 +148,7 @@ class IngestService:
         try:
             account = self._ctx.accounts.lookup_by_name(account_name)
             logger.debug(f"Resolved account '{account_name}' to id={account.id}")
-        except Exception:
+        except AccountNotFound:
             logger.error(f"Account '{account_name}' not found in book '{book.name}'")
             raise ValueError(f"Account '{account_name}' not found in book '{book.name}'")
 
@@ -102,35 +172,39 @@ class IngestService:
 
         # Categorize transactions where L field is missing
         logger.debug("Categorizing transactions without L field")
-        categorize_svc = CategorizeService(ctx=self._ctx, rules_path=self.category_rules_path)
         categorized_count = 0
         uncategorized_count = 0
 
-        for txn in qif.transactions:
-            if not Qif.get_category(txn):
-                payee = Qif.normalized_payee(txn)
-                result = categorize_svc.lookup_category_for_payee(payee)
-                if result:
-                    category_name, _ = result
-                    Qif.set_category(txn, category_name)
-                    categorized_count += 1
-                else:
-                    # Default to Uncategorized when no category can be determined
-                    Qif.set_category(txn, UNCATEGORIZED_ACCOUNT)
-                    uncategorized_count += 1
+        uncategorized = [
+            (txn, Qif.normalized_payee(txn))
+            for txn in qif.transactions
+            if not Qif.get_category(txn)
+        ]
+        categories = self.categorize.lookup_categories_for_payees([p for _, p in uncategorized])
+        for txn, payee in uncategorized:
+            result = categories.get(payee)
+            if result:
+                category_name, _ = result
+                Qif.set_category(txn, category_name)
+                categorized_count += 1
+            else:
+                # Default to Uncategorized when no category can be determined
+                Qif.set_category(txn, UNCATEGORIZED_ACCOUNT)
+                uncategorized_count += 1
 
         if categorized_count > 0 or uncategorized_count > 0:
             logger.debug(
                 f"Categorization: {categorized_count} auto-categorized, {uncategorized_count} defaulted to Uncategorized"
             )
 
-        # Convert to Transaction objects
+        # Convert to Transaction objects, resolving split accounts from one bulk load
+        accounts_by_name = self._ctx.accounts.accounts_by_full_name()
+
         def resolve_account(name):
-            try:
-                return self._ctx.accounts.lookup_by_name(name)
-            except Exception:
+            account = accounts_by_name.get(name)
+            if account is None:
                 logger.warning(f"Could not resolve account '{name}'")
-                return None
+            return account
 
         logger.debug("Converting QIF to Transaction objects")
         transactions = qif.as_transactions(book.id, resolve_account)
@@ -175,15 +249,20 @@ class IngestService:
 
                 # Collect transactions to insert (excluding matched ones)
                 to_insert = []
+                matched = []
                 for action, txn in matching_svc.match_transactions(
                     account, transactions, candidates
                 ):
                     if action == 'match':
-                        self._ctx.transactions.mark_matched(txn)
+                        matched.append(txn)
                         stats['matched'] += 1
                     else:
                         to_insert.append(txn)
 
+                # Mark all matched candidates with one UPDATE
+                if matched:
+                    self._ctx.transactions.mark_matched_bulk(matched)
+
                 # Batch insert all at once
                 if to_insert:
                     self._ctx.transactions.insert_bulk(to_insert)
@@ -198,7 +277,7 @@ class IngestService:
             stats['imported'] = len(transactions)
 
         # Record import
-        dates = [t.transaction_date for t in transactions]
+        coverage_start, coverage_end = date_span(transactions)
         import_file = self._ctx.dal.create_import_file(
             book_id=book.id,
             account_id=account.id,
@@ -206,8 +285,8 @@ class IngestService:
             source_type='qif',
             file_hash=file_hash,
             source_path=file_path,
-            coverage_start=min(dates) if dates else None,
-            coverage_end=max(dates) if dates else None,
+            coverage_start=coverage_start,
+            coverage_end=coverage_end,
             row_count=len(transactions),
         )
 
@@ -231,12 +310,3 @@ class IngestService:
     def get_import(self, import_file_id: int) -> ImportFile | None:
         """Get an import file by ID."""
         return self._ctx.dal.get_import_file(import_file_id)
-
-    @staticmethod
-    def _compute_file_hash(file_path: str) -> str:
-        """Compute SHA-256 hash of a file."""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
@@ -1,9 +1,12 @@
 import json
 
-from sqlalchemy import text
+from sqlalchemy import MetaData, bindparam, inspect, select, text, update
+from sqlalchemy.schema import CreateTable
 
 from ledger.business.base_service import BaseService
-from ledger.db.models import Base
+from ledger.business.book_context import clear_book_cache
+from ledger.db.models import Base, Split, Transaction
+from ledger.util.normalize import normalize_payee
 
 
 class ManagementService(BaseService):
@@ -12,6 +15,124 @@ class ManagementService(BaseService):
         connection = self.session.connection()
         Base.metadata.drop_all(connection)
         Base.metadata.create_all(connection)
+        clear_book_cache()
+
+    def migrate_split_amount_to_e4(self) -> bool:
+        """
+        Convert an existing split.amount DECIMAL(20,4) column to split.amount_e4
+        BIGINT NOT NULL (integer 1/10000ths), matching a freshly created schema.
+
+        Every step runs in the session's transaction, so a failure leaves the table
+        as it was. A table left part way by an earlier version of this migration
+        (the integer column added but nullable, named amount_cents, or amount not
+        yet dropped) is finished. Returns False if the schema is already current.
+        """
+        connection = self.session.connection()
+        columns = {c['name']: c for c in inspect(connection).get_columns('split')}
+        current = columns.get('amount_e4')
+        legacy = {'amount', 'amount_cents'} & columns.keys()
+        if current is not None and not current['nullable'] and not legacy:
+            return False
+
+        # Existing integer values win; only rows still missing one are converted
+        sources = [
+            expr
+            for column, expr in (
+                ('amount_e4', "amount_e4"),
+                ('amount_cents', "amount_cents"),
+                ('amount', "CAST(ROUND(amount * 10000) AS BIGINT)"),
+            )
+            if column in columns
+        ]
+        amount_e4 = sources[0] if len(sources) == 1 else f"COALESCE({', '.join(sources)})"
+
+        if connection.dialect.name == 'sqlite':
+            self._rebuild_split_table(connection, columns, amount_e4)
+            return True
+
+        if current is None:
+            connection.execute(text("ALTER TABLE split ADD COLUMN amount_e4 BIGINT"))
+        connection.execute(
+            text(f"UPDATE split SET amount_e4 = {amount_e4} WHERE amount_e4 IS NULL")
+        )
+        connection.execute(text("ALTER TABLE split ALTER COLUMN amount_e4 SET NOT NULL"))
+        for column in sorted(legacy):
+            connection.execute(text(f"ALTER TABLE split DROP COLUMN {column}"))
+        return True
+
+    @staticmethod
+    def _rebuild_split_table(connection, old_columns: dict, amount_e4: str) -> None:
+        """
+        Recreate split from the model and copy its rows across, computing amount_e4
+        with the given SQL expression. SQLite can't add NOT NULL to an existing column
+        (and only drops columns from 3.35), so the table is rebuilt under a temporary
+        name and renamed into place.
+        """
+        # pysqlite doesn't BEGIN before DDL; open the transaction here so the rebuild
+        # commits or rolls back as a whole with the session
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+
+        metadata = MetaData()
+        for table in Base.metadata.sorted_tables:
+            table.to_metadata(metadata)
+        new_table = metadata.tables['split'].to_metadata(metadata, name='split_new')
+        connection.execute(CreateTable(new_table))
+
+        copied = ', '.join(
+            c.name for c in new_table.columns if c.name in old_columns and c.name != 'amount_e4'
+        )
+        connection.execute(
+            text(
+                f"INSERT INTO split_new ({copied}, amount_e4) "
+                f"SELECT {copied}, {amount_e4} FROM split"
+            )
+        )
+        connection.execute(text("DROP TABLE split"))
+        connection.execute(text("ALTER TABLE split_new RENAME TO split"))
+        for index in Split.__table__.indexes:
+            index.create(connection)
+
+    def create_missing_indexes(self) -> list[str]:
+        """
+        Create indexes declared on the models that an existing database lacks
+        (create_all only adds them for new tables). Returns the names created.
+        """
+        connection = self.session.connection()
+        inspector = inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {i['name'] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(connection)
+                    created.append(index.name)
+        return created
+
+    def backfill_payee_norm(self) -> int:
+        """
+        Fill transaction.payee_norm for rows imported before it was stored, so consumers
+        never have to normalize descriptions again. Returns the number of rows updated.
+        """
+        rows = self.session.execute(
+            select(Transaction.id, Transaction.transaction_description).where(
+                Transaction.payee_norm.is_(None), Transaction.transaction_description.is_not(None)
+            )
+        ).all()
+        if not rows:
+            return 0
+        table = Transaction.__table__
+        stmt = (
+            update(table).where(table.c.id == bindparam('txn_id')).values(payee_norm=bindparam('p'))
+        )
+        self.session.execute(
+            stmt,
+            [{'txn_id': txn_id, 'p': normalize_payee(desc)} for txn_id, desc in rows],
+        )
+        return len(rows)
 
     def export_account_hierarchy_as_json(self):
         """
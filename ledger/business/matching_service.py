@@ -1,7 +1,8 @@
 import json
 import re
+from collections import defaultdict
 from datetime import timedelta, date
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from logging import getLogger
 
 from ledger.config import MATCHING_RULES_PATH
@@ -12,6 +13,63 @@ logger = getLogger(__name__)
 DEFAULT_DATE_OFFSET = 1
 
 
+def date_span(transactions: Iterable[Transaction]) -> tuple[date | None, date | None]:
+    """Earliest and latest transaction_date in one pass; (None, None) when empty."""
+    lo = hi = None
+    for txn in transactions:
+        d = txn.transaction_date
+        if lo is None or d < lo:
+            lo = d
+        if hi is None or d > hi:
+            hi = d
+    return lo, hi
+
+
+class _CandidateIndex:
+    """
+    Candidates keyed on what is_match() requires, so each import is only checked
+    against the candidates it could match instead of all of them.
+
+    A candidate can match an import when both carry the same transfer_reference, or
+    (unless both carry one) when its splits match the import's; then its first
+    split's (account_id, amount) is among the import's. possible_matches() returns
+    those candidates in their original order, so is_match() still picks the first
+    one that matches exactly as a full scan would.
+    """
+
+    def __init__(self, candidates: list[Transaction]):
+        self.candidates = candidates
+        self.by_reference: dict[str, list[int]] = defaultdict(list)
+        # (account_id, amount) of the first split -> positions; without_reference only
+        # holds candidates that have no transfer_reference
+        self.by_split: dict[tuple, list[int]] = defaultdict(list)
+        self.by_split_without_reference: dict[tuple, list[int]] = defaultdict(list)
+        for position, candidate in enumerate(candidates):
+            reference = candidate.transfer_reference
+            if reference:
+                self.by_reference[reference].append(position)
+            if not candidate.splits:
+                # Only matchable by reference, or by an import without splits
+                continue
+            first = candidate.splits[0]
+            key = (first.account_id, first.amount)
+            self.by_split[key].append(position)
+            if not reference:
+                self.by_split_without_reference[key].append(position)
+
+    def possible_matches(self, txn_import: Transaction) -> list[Transaction]:
+        reference = txn_import.transfer_reference
+        if not txn_import.splits:
+            return self.candidates
+        by_split = self.by_split_without_reference if reference else self.by_split
+        positions = set()
+        if reference:
+            positions.update(self.by_reference.get(reference, ()))
+        for key in {(s.account_id, s.amount) for s in txn_import.splits}:
+            positions.update(by_split.get(key, ()))
+        return [self.candidates[p] for p in sorted(positions)]
+
+
 class MatchingRules:
     '''
     Example matching rules:
@@ -91,12 +149,10 @@ class MatchingService:
         Calculate the date range (with buffer) to query potential candidate transactions.
         Caller should use this to fetch candidates efficiently.
         """
-        if not to_import:
+        min_date, max_date = date_span(to_import)
+        if min_date is None:
             return date.today(), date.today()
 
-        min_date = min(txn.transaction_date for txn in to_import)
-        max_date = max(txn.transaction_date for txn in to_import)
-
         buffer = timedelta(days=DEFAULT_DATE_OFFSET)
         return min_date - buffer, max_date + buffer
 
@@ -133,11 +189,12 @@ class MatchingService:
         logger.debug(f"Matchable accounts: {list(matchable_accounts)}")
         match_count = 0
         import_count = 0
+        index = _CandidateIndex(candidates)
 
         for txn_import in to_import:
             matched = False
 
-            for txn_candidate in candidates:
+            for txn_candidate in index.possible_matches(txn_import):
                 if self.is_match(import_for, txn_import, txn_candidate):
                     logger.debug(
                         f"MATCH: import '{txn_import.transaction_description}' -> candidate id={txn_candidate.id}"
@@ -0,0 +1,118 @@
+# session_scope.py
+"""SessionScope owns the session lifecycle shared by BaseService and BookContext."""
+
+from logging import getLogger
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+
+from ledger.db.data_access import DAL
+from ledger.db.engine import get_engine
+
+logger = getLogger(__name__)
+
+# Session.info flag set once a statement other than a SELECT runs in the transaction
+_WROTE = 'has_writes'
+# Connection.info key pointing at the info dict of the session using the connection
+_SESSION_INFO = 'session_info'
+_READ_ONLY_PREFIXES = ('SELECT', 'PRAGMA')
+
+
+def _bind_connection(session: Session, transaction: SessionTransaction, connection: Connection):
+    # A new database transaction starts clean; writes settled by an earlier
+    # commit or rollback don't need another COMMIT
+    session.info.pop(_WROTE, None)
+    connection.info[_SESSION_INFO] = session.info
+
+
+def _unbind_connection(dbapi_connection, connection_record) -> None:
+    # Connection.info lives on the pooled connection; drop the session pointer when
+    # it goes back so the next user of the connection can't flag a finished session
+    connection_record.info.pop(_SESSION_INFO, None)
+
+
+def _note_write(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Cursor level, so ORM flushes, Core statements and text() run on
+    # session.connection() are all seen
+    if not statement.lstrip()[:6].upper().startswith(_READ_ONLY_PREFIXES):
+        session_info = conn.info.get(_SESSION_INFO)
+        if session_info is not None:
+            session_info[_WROTE] = True
+
+
+def _has_writes(session: Session) -> bool:
+    """Whether ending the session's transaction needs a COMMIT rather than a ROLLBACK."""
+    return bool(session.new or session.dirty or session.deleted or session.info.get(_WROTE))
+
+
+class SessionScope:
+    """
+    One session and DAL per enter/exit, on the shared engine for db_url.
+
+    With an external session, enter() hands it back as-is and exit() leaves its
+    lifecycle to the caller.
+
+    Sessions are created with expire_on_commit=False so objects loaded in a context
+    (e.g. prefetched accounts) stay usable after the DAL's per-write commits without
+    a refresh SELECT each. They also use autoflush=False: pending changes are not
+    visible to queries until flushed, which the DAL does by committing after each write.
+    """
+
+    def __init__(self, db_url: str | None = None, session: Session | None = None):
+        self.db_url = db_url
+        self.external = session is not None
+        self.session = session
+        self.dal = DAL(session=session) if session is not None else None
+        self.engine: Engine | None = None
+        self.session_factory: sessionmaker | None = None
+
+    def enter(self) -> tuple[Session, DAL]:
+        """Open a session (resolving the engine on first use) and return it with its DAL."""
+        if not self.external:
+            if self.session_factory is None:
+                self.engine = get_engine(self.db_url)
+                self.session_factory = sessionmaker(
+                    bind=self.engine, expire_on_commit=False, autoflush=False
+                )
+                event.listen(self.session_factory, 'after_begin', _bind_connection)
+                if not event.contains(self.engine, 'before_cursor_execute', _note_write):
+                    event.listen(self.engine, 'before_cursor_execute', _note_write)
+                if not event.contains(self.engine, 'checkin', _unbind_connection):
+                    event.listen(self.engine, 'checkin', _unbind_connection)
+            self.session = self.session_factory()
+            self.session.begin()
+            self.dal = DAL(session=self.session)
+        return self.session, self.dal
+
+    def exit(self, exc_type=None) -> None:
+        """
+        Commit the open transaction, or roll it back if exc_type is set, then close.
+
+        A transaction that wrote nothing is not committed: closing the session hands
+        the connection back to the pool, which rolls it back. Unlike rollback(), this
+        leaves the objects loaded in the context readable after exit.
+        """
+        if self.external:
+            logger.debug("External session, skipping cleanup")
+            return
+        if self.session is None:
+            return
+        try:
+            # DAL writes commit as they go; only finish a transaction that is still open
+            if not self.session.in_transaction():
+                logger.debug("No open transaction, nothing to commit")
+            elif exc_type:
+                logger.debug(f"Exception occurred ({exc_type.__name__}), rolling back")
+                self.session.rollback()
+            elif not _has_writes(self.session):
+                # Read-only: close() below releases the transaction without a commit
+                logger.debug("No writes in transaction, releasing it")
+            else:
+                logger.debug("Committing session")
+                self.session.commit()
+        finally:
+            logger.debug("Closing session")
+            self.session.close()
+            self.session = None
+            self.dal = None
@@ -1,9 +1,12 @@
 # transaction_service.py
 """Transaction service for managing transactions within a book."""
+from collections.abc import Iterator, Sequence
 from decimal import Decimal
 from datetime import datetime, date
 from logging import getLogger
 
+from sqlalchemy.engine import RowMapping
+
 from ledger.db.models import Transaction, Book
 from ledger.db.data_access import DAL
 
@@ -72,6 +75,10 @@ class TransactionService:
             self._book.id, start_date, end_date, account_names or []
         )
 
+    def rows_in_range(self, start_date: date, end_date: date) -> Sequence[RowMapping]:
+        """Column-only split rows in date range, for reports that don't need ORM objects."""
+        return self._dal.get_transactions_rows_in_range(self._book.id, start_date, end_date)
+
     def delete(self, transaction_id: int):
         """Delete a transaction. Raises ValueError if not found."""
         txn = self._dal.get_transaction(txn_id=transaction_id)
@@ -84,8 +91,16 @@ class TransactionService:
         """Mark a transaction as matched."""
         self._dal.update_transaction_match_status(transaction)
 
+    def mark_matched_bulk(self, transactions: list[Transaction]) -> None:
+        """Mark many transactions as matched with one batched UPDATE and commit."""
+        self._dal.update_transactions_match_status(transactions)
+
     def get_all(self) -> list[Transaction]:
         """Get all transactions in this book."""
+        return list(self._dal.list_transactions_for_book(book_id=self._book.id))
+
+    def iter_all(self) -> Iterator[Transaction]:
+        """Stream all transactions in this book without materializing the full list."""
         return self._dal.list_transactions_for_book(book_id=self._book.id)
 
     def find_by_transfer_references(
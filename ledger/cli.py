@@ -78,6 +78,9 @@ def main():
     if args.command == 'init-db':
         do_init_db(args.db_url, args.confirm)
 
+    elif args.command == 'migrate-db':
+        do_migrate_db(args.db_url)
+
     elif args.command == "init-book":
         do_init_book(args.db_url, args.book_name)
 
@@ -116,7 +119,7 @@ def main():
     elif args.command == "ingest":
         do_ingest(
             args.db_url,
-            args.file_path,
+            args.file_paths,
             args.book_name,
         )
 
@@ -157,6 +160,11 @@ def parse_arguments():
         help="This flag must be passed to avoid accidental dropping of database.",
     )
 
+    # migrate-db
+    subparsers.add_parser(
+        "migrate-db", help="Upgrade an existing DB schema in place (split amounts to integers)"
+    )
+
     # init-book
     sp_init_book = subparsers.add_parser("init-book", help="Create a new Book if it doesn't exist")
     sp_init_book.add_argument(
@@ -226,10 +234,10 @@ def parse_arguments():
     sp_delete_txn.add_argument("--txn-id", "-T", required=True, help="Transaction ID")
 
     # ingest
-    sp_ingest = subparsers.add_parser(
-        "ingest", help="Ingest a QIF file with file-level idempotency"
+    sp_ingest = subparsers.add_parser("ingest", help="Ingest QIF files with file-level idempotency")
+    sp_ingest.add_argument(
+        "file_paths", nargs="+", metavar="file_path", help="Path to QIF file(s) to ingest"
     )
-    sp_ingest.add_argument("file_path", help="Path to QIF file to ingest")
     sp_ingest.add_argument(
         "--book-name", "-b", default=DEFAULT_BOOK, help=f"Book name (default: '{DEFAULT_BOOK}')"
     )
@@ -368,23 +376,41 @@ def do_init_db(db_url, confirm):
         print('Resetting the database requires the "--confirm" flag.')
 
 
-def do_ingest(db_url, file_path, book_name):
-    """Ingest a QIF file."""
-    # Verify file type
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
-
-    if ext != '.qif':
-        print(f"Error: Unsupported file type '{ext}'. Use .qif")
-        return 1
+def do_migrate_db(db_url):
+    with ManagementService().init_with_url(db_url=db_url) as mgmt_service:
+        migrated = mgmt_service.migrate_split_amount_to_e4()
+        created_indexes = mgmt_service.create_missing_indexes()
+        backfilled = mgmt_service.backfill_payee_norm()
+    if migrated:
+        print(f"Migrated split amounts to integer storage ({db_url}).")
+    for name in created_indexes:
+        print(f"Created index {name} ({db_url}).")
+    if backfilled:
+        print(f"Backfilled normalized payees on {backfilled} transactions ({db_url}).")
+    if not migrated and not created_indexes and not backfilled:
+        print(f"Database schema is already current ({db_url}).")
+
+
+def do_ingest(db_url, file_paths, book_name):
+    """Ingest QIF files, sharing one book context (session, accounts, rules) across them."""
+    # Verify file types
+    for file_path in file_paths:
+        _, ext = os.path.splitext(file_path)
+        ext = ext.lower()
+
+        if ext != '.qif':
+            print(f"Error: Unsupported file type '{ext}' for {file_path}. Use .qif")
+            return 1
 
+    status = 0
     with BookContext(book_name, db_url) as ctx:
-        try:
-            ingest_svc = IngestService(ctx)
-            report = ingest_svc.ingest_qif(file_path=file_path)
-
+        ingest_svc = IngestService(ctx)
+        for file_path, report in ingest_svc.ingest_qifs(file_paths):
             # Print result
-            if report.result == IngestResult.IMPORTED:
+            if isinstance(report, ValueError):
+                print(f"Error: {file_path}: {report}")
+                status = 1
+            elif report.result == IngestResult.IMPORTED:
                 print(f"✓ {report.message}")
                 print(f"  Import ID: {report.import_file_id}")
                 print(f"  Transactions imported: {report.transactions_imported}")
@@ -396,13 +422,9 @@ def do_ingest(db_url, file_path, book_name):
             elif report.result == IngestResult.HASH_MISMATCH:
                 print(f"⚠ {report.message}")
                 print(f"  Existing import ID: {report.import_file_id}")
-                return 1
-
-        except ValueError as e:
-            print(f"Error: {e}")
-            return 1
+                status = 1
 
-    return 0
+    return status
 
 
 def do_list_imports(db_url, book_name):
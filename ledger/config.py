@@ -19,3 +19,8 @@ UNCATEGORIZED_ACCOUNT = os.environ.get('LEDGER_UNCATEGORIZED_ACCOUNT', 'Expenses
 
 # Path to matching rules JSON file
 MATCHING_RULES_PATH = os.environ.get('LEDGER_MATCHING_RULES_PATH', 'etc/matching-rules.json')
+
+# Connection pool sizing for file/server databases (in-memory SQLite keeps its default pool)
+DB_POOL_SIZE = int(os.environ.get('LEDGER_DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.environ.get('LEDGER_DB_MAX_OVERFLOW', '20'))
+DB_POOL_RECYCLE = int(os.environ.get('LEDGER_DB_POOL_RECYCLE', '3600'))
@@ -1,9 +1,13 @@
 # data_access.py
-from datetime import datetime
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
 from logging import getLogger
 
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import and_, bindparam, insert, lambda_stmt, select, tuple_, update
+from sqlalchemy.engine import RowMapping
 
 from ledger.db.models import (
     Book,
@@ -17,14 +21,55 @@ from ledger.db.models import (
 
 logger = getLogger(__name__)
 
+# Rows fetched per batch when streaming large result sets
+YIELD_PER = 1000
+
+# Maximum values bound into a single IN (...) clause
+IN_CHUNK_SIZE = 1000
+
+
+def _chunks(values: Iterable, size: int = IN_CHUNK_SIZE) -> Iterator[list]:
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
 
 class DAL:
     def __init__(self, session):
         self.session = session
+        # Open deferred_commits() blocks; while nonzero, writes flush instead of committing
+        self._defer_depth = 0
 
     def close(self):
         self.session.close()
 
+    def _commit(self):
+        if self._defer_depth:
+            self.session.flush()
+        else:
+            self.session.commit()
+
+    @contextmanager
+    def deferred_commits(self):
+        """
+        Run the writes in the block as one database transaction.
+
+        Each write flushes instead of committing, so later queries in the block still
+        see it. The outermost block commits once when it exits cleanly and rolls
+        everything back if it raises.
+        """
+        self._defer_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._defer_depth -= 1
+            if not self._defer_depth:
+                self.session.rollback()
+            raise
+        self._defer_depth -= 1
+        if not self._defer_depth:
+            self.session.commit()
+
     # --------------------------------------------------------------------------
     # Book
     # --------------------------------------------------------------------------
@@ -32,7 +77,7 @@ class DAL:
         logger.debug(f"Creating book '{name}'")
         book = Book(name=name)
         self.session.add(book)
-        self.session.commit()
+        self._commit()
         logger.debug(f"Created book '{name}' with id={book.id}")
         return book
 
@@ -71,42 +116,143 @@ class DAL:
             placeholder=placeholder,
         )
         self.session.add(account)
-        self.session.commit()
+        self._commit()
         logger.debug(f"Created account '{full_name}' with id={account.id}")
         return account
 
     def get_account(self, account_id: str) -> Account | None:
-        return self.session.query(Account).filter_by(id=account_id).one_or_none()
+        # Session.get returns an already-loaded instance from the identity map without SQL
+        return self.session.get(Account, account_id)
+
+    def get_accounts_by_ids(self, account_ids: Iterable[int]) -> list[Account]:
+        """Load many accounts by primary key, IN_CHUNK_SIZE ids per SELECT."""
+        accounts = []
+        for chunk in _chunks(set(account_ids)):
+            accounts.extend(self.session.scalars(select(Account).where(Account.id.in_(chunk))))
+        return accounts
+
+    def get_accounts_by_fullnames_for_book(
+        self, book_id: str, full_names: Iterable[str]
+    ) -> list[Account]:
+        """Load many accounts of a book by full name, IN_CHUNK_SIZE names per SELECT."""
+        accounts = []
+        for chunk in _chunks(set(full_names)):
+            stmt = select(Account).where(Account.book_id == book_id, Account.full_name.in_(chunk))
+            accounts.extend(self.session.scalars(stmt))
+        return accounts
 
     def get_account_by_fullname_for_book(self, book_id: str, acct_fullname: str) -> Account | None:
-        account = (
-            self.session.query(Account)
-            .filter_by(book_id=book_id, full_name=acct_fullname)
-            .one_or_none()
+        # lambda_stmt caches the constructed statement; closure vars become bound params
+        stmt = lambda_stmt(
+            lambda: select(Account).where(
+                Account.book_id == book_id, Account.full_name == acct_fullname
+            )
         )
-        return account
+        return self.session.scalars(stmt).one_or_none()
 
     def get_account_by_name_for_book(
         self, book_id: str, acct_code, acct_name: str
     ) -> Account | None:
-        account = (
-            self.session.query(Account)
-            .filter_by(book_id=book_id, code=acct_code, name=acct_name)
-            .one_or_none()
+        stmt = lambda_stmt(
+            lambda: select(Account).where(
+                Account.book_id == book_id, Account.code == acct_code, Account.name == acct_name
+            )
         )
-        return account
+        return self.session.scalars(stmt).one_or_none()
+
+    def get_accounts_by_name_pairs_for_book(
+        self, book_id: str, pairs: set[tuple[str, str]]
+    ) -> dict[tuple[str, str], Account]:
+        """Resolve many (code, name) pairs with one SELECT, keyed by (code, name)."""
+        if not pairs:
+            return {}
+        stmt = select(Account).where(
+            Account.book_id == book_id, tuple_(Account.code, Account.name).in_(list(pairs))
+        )
+        return {(a.code, a.name): a for a in self.session.scalars(stmt)}
+
+    def create_accounts(self, accounts: list[Account]) -> list[Account]:
+        """Insert many accounts in a single flush and commit."""
+        logger.debug(f"Creating {len(accounts)} accounts")
+        self.session.add_all(accounts)
+        self._commit()
+        return accounts
+
+    def list_accounts_for_book(
+        self, book_id: str, with_splits: bool = False, raise_on_lazy: bool = False
+    ) -> list[Account]:
+        """
+        List accounts for a book, optionally with their splits loaded in one query.
 
-    def list_accounts_for_book(self, book_id: str) -> list[Account]:
-        return self.session.query(Account).filter_by(book_id=book_id).all()
+        With raise_on_lazy, touching any relationship that was not loaded raises
+        instead of issuing a lazy SELECT per account; callers that keep the accounts
+        around (e.g. BookContext's prefetch) leave it off so relationships still load.
+        """
+        options = [raiseload("*")] if raise_on_lazy else []
+        if with_splits:
+            options.insert(0, selectinload(Account.splits))
+        stmt = select(Account).where(Account.book_id == book_id).options(*options)
+        return list(self.session.scalars(stmt).all())
+
+    def accounts_by_full_name(
+        self, book_id: str, raise_on_lazy: bool = False
+    ) -> dict[str, Account]:
+        """Load all accounts for a book in one SELECT, keyed by full name."""
+        stmt = select(Account).where(Account.book_id == book_id)
+        if raise_on_lazy:
+            stmt = stmt.options(raiseload("*"))
+        rows = self.session.scalars(stmt).all()
+        return {a.full_name: a for a in rows}
 
     # --------------------------------------------------------------------------
     # Transactions
     # --------------------------------------------------------------------------
     def insert_transactions(self, transactions: list[Transaction]):
+        """
+        Batch insert transactions and their splits with Core INSERTs.
+
+        The transactions are plain column dicts fed to one executemany INSERT ...
+        RETURNING id; the generated ids are stitched onto the split rows, which are
+        inserted with a second executemany. This skips the ORM unit of work (autoflush,
+        cascades, per-object events) entirely. The passed objects are not added to the
+        session.
+        """
+        if not transactions:
+            return
         logger.debug(f"Batch inserting {len(transactions)} transactions")
+        txn_rows = [
+            {
+                'book_id': t.book_id,
+                'import_file_id': t.import_file_id,
+                'transaction_date': t.transaction_date,
+                'transaction_description': t.transaction_description,
+                'payee_norm': t.payee_norm,
+                'match_status': t.match_status or 'n',
+                'memo': t.memo,
+                'transfer_reference': t.transfer_reference,
+            }
+            for t in transactions
+        ]
         try:
-            self.session.add_all(transactions)
-            self.session.commit()
+            with self.session.no_autoflush:
+                txn_ids = self.session.scalars(
+                    insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                    txn_rows,
+                ).all()
+                split_rows = [
+                    {
+                        'transaction_id': txn_id,
+                        'account_id': s.account_id,
+                        'amount_e4': s.amount_e4,
+                        'memo': s.memo,
+                        'reconcile_state': s.reconcile_state or 'n',
+                    }
+                    for t, txn_id in zip(transactions, txn_ids)
+                    for s in t.splits
+                ]
+                if split_rows:
+                    self.session.execute(insert(Split), split_rows)
+            self._commit()
             logger.debug(f"Batch inserted {len(transactions)} transactions")
         except Exception as e:
             logger.error(f"Failed to insert transactions: {e}")
@@ -117,7 +263,7 @@ class DAL:
         logger.debug(f"Inserting transaction: '{txn.transaction_description}'")
         try:
             self.session.add(txn)
-            self.session.commit()
+            self._commit()
             logger.debug(f"Inserted transaction id={txn.id}")
         except Exception as e:
             logger.error(f"Failed to insert transaction: {e}")
@@ -131,7 +277,27 @@ class DAL:
                 {"match_status": match_status}
             )
             transaction.match_status = match_status
-            self.session.commit()
+            self._commit()
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def update_transactions_match_status(
+        self, transactions: Iterable[Transaction], match_status='m'
+    ) -> None:
+        """Set match_status on many transactions, IN_CHUNK_SIZE ids per UPDATE, one commit."""
+        transactions = list(transactions)
+        try:
+            for chunk in _chunks({t.id for t in transactions}):
+                self.session.execute(
+                    update(Transaction)
+                    .where(Transaction.id.in_(chunk))
+                    .values(match_status=match_status)
+                    .execution_options(synchronize_session=False)
+                )
+            for transaction in transactions:
+                transaction.match_status = match_status
+            self._commit()
         except Exception as e:
             self.session.rollback()
             raise e
@@ -146,7 +312,7 @@ class DAL:
             memo=memo,
         )
         self.session.add(txn)
-        self.session.commit()
+        self._commit()
         return txn
 
     def get_transaction(self, txn_id: str) -> Transaction | None:
@@ -157,13 +323,24 @@ class DAL:
             .one_or_none()
         )
 
-    def list_transactions_for_book(self, book_id: str) -> list[Transaction]:
-        return (
-            self.session.query(Transaction)
-            .options(joinedload(Transaction.splits).joinedload(Split.account))
-            .filter_by(book_id=book_id)
-            .all()
+    def list_transactions_for_book(self, book_id: str) -> Iterator[Transaction]:
+        """
+        Stream all transactions for a book, YIELD_PER rows at a time.
+
+        Splits are loaded per batch with selectinload (joined eager loading of a
+        collection cannot be combined with yield_per). Any other relationship raises
+        on access instead of lazy loading. Wrap in list() if the full result is needed.
+        """
+        stmt = (
+            select(Transaction)
+            .where(Transaction.book_id == book_id)
+            .options(
+                selectinload(Transaction.splits).joinedload(Split.account),
+                raiseload("*"),
+            )
+            .execution_options(yield_per=YIELD_PER)
         )
+        yield from self.session.scalars(stmt)
 
     def query_for_unmatched_transactions_in_range(
         self,
@@ -176,29 +353,50 @@ class DAL:
         logger.debug(
             f"Querying unmatched transactions: {start_date} to {end_date}, accounts={accounts_to_match_for}"
         )
-        query = (
-            self.session.query(Transaction)
+        # book_id leads to match ix_transactions_book_date; the date range is a single
+        # BETWEEN predicate so the planner range-scans within the book.
+        stmt = (
+            select(Transaction)
             .join(Split)
             .join(Account)
-            .filter(
-                and_(
-                    Transaction.book_id == book_id,
-                    Transaction.transaction_date >= start_date,
-                    Transaction.transaction_date <= end_date,
-                    Transaction.match_status == "n",
-                    Account.full_name.in_(accounts_to_match_for),
-                )
-            )
+            .where(Transaction.book_id == book_id)
+            .where(Transaction.transaction_date.between(start_date, end_date))
+            .where(Transaction.match_status == "n")
+            .where(Account.full_name.in_(accounts_to_match_for))
             .options(joinedload(Transaction.splits).joinedload(Split.account))
         )
 
         if reconciliation_status:
-            query = query.filter(Split.reconcile_state == reconciliation_status)
+            stmt = stmt.where(Split.reconcile_state == reconciliation_status)
 
-        results = query.all()
+        results = self.session.scalars(stmt).unique().all()
         logger.debug(f"Found {len(results)} unmatched transactions")
         return results
 
+    def get_transactions_rows_in_range(
+        self, book_id: int, start_date: date, end_date: date
+    ) -> Sequence[RowMapping]:
+        """
+        Read-only split rows for transactions in a date range, one mapping per split.
+
+        Selects columns only, so no ORM objects are built or added to the identity map.
+        Use the ORM queries for anything that modifies transactions.
+        """
+        stmt = (
+            select(
+                Transaction.id,
+                Transaction.transaction_date,
+                Transaction.transaction_description,
+                Split.amount.label('amount'),
+                Split.account_id,
+            )
+            .join(Split)
+            .where(Transaction.book_id == book_id)
+            .where(Transaction.transaction_date.between(start_date, end_date))
+            .order_by(Transaction.transaction_date, Transaction.id)
+        )
+        return self.session.execute(stmt).mappings().all()
+
     def get_transactions_by_transfer_references(
         self, book_id: int, transfer_references: list[str]
     ) -> list[Transaction]:
@@ -233,7 +431,7 @@ class DAL:
         for split in splits:
             self.session.delete(split)
         self.session.delete(txn)
-        self.session.commit()
+        self._commit()
         logger.debug(f"Deleted transaction id={txn_id} with {split_count} splits")
         return True
 
@@ -256,7 +454,7 @@ class DAL:
             reconcile_state=reconcile_state,
         )
         self.session.add(spl)
-        self.session.commit()
+        self._commit()
         return spl
 
     # --------------------------------------------------------------------------
@@ -290,7 +488,7 @@ class DAL:
             row_count=row_count,
         )
         self.session.add(import_file)
-        self.session.commit()
+        self._commit()
         logger.debug(f"Created import file id={import_file.id} for '{filename}'")
         return import_file
 
@@ -322,7 +520,13 @@ class DAL:
     # --------------------------------------------------------------------------
     def get_category_from_cache(self, payee_norm: str) -> CategoryCache | None:
         """Look up a category by normalized payee."""
-        return self.session.query(CategoryCache).filter_by(payee_norm=payee_norm).one_or_none()
+        # payee_norm is the primary key: served from the identity map when already loaded
+        return self.session.get(CategoryCache, payee_norm)
+
+    def get_category_cache_map(self) -> dict[str, int]:
+        """Load the whole category cache as payee_norm -> account_id with one SELECT."""
+        stmt = select(CategoryCache.payee_norm, CategoryCache.account_id)
+        return dict(self.session.execute(stmt).tuples().all())
 
     def set_category_cache(self, payee_norm: str, account_id: int) -> CategoryCache:
         """Set or update a category cache entry."""
@@ -331,7 +535,7 @@ class DAL:
             existing.account_id = account_id
             existing.hit_count += 1
             existing.last_seen_at = datetime.now()
-            self.session.commit()
+            self._commit()
             return existing
         else:
             cache_entry = CategoryCache(
@@ -340,7 +544,7 @@ class DAL:
                 hit_count=1,
             )
             self.session.add(cache_entry)
-            self.session.commit()
+            self._commit()
             return cache_entry
 
     def increment_cache_hit(self, payee_norm: str) -> None:
@@ -349,7 +553,92 @@ class DAL:
         if entry:
             entry.hit_count += 1
             entry.last_seen_at = datetime.now()
-            self.session.commit()
+            self._commit()
+
+    def get_categories_from_cache_bulk(
+        self, payee_norms: Iterable[str]
+    ) -> dict[str, CategoryCache]:
+        """Look up many normalized payees, IN_CHUNK_SIZE per SELECT, keyed by payee_norm."""
+        entries = {}
+        for chunk in _chunks(set(payee_norms)):
+            stmt = select(CategoryCache).where(CategoryCache.payee_norm.in_(chunk))
+            entries.update((e.payee_norm, e) for e in self.session.scalars(stmt))
+        return entries
+
+    def get_cached_category_accounts(
+        self, book_id: int, payee_norms: Iterable[str]
+    ) -> dict[str, Account]:
+        """
+        Resolve many normalized payees straight to their cached category accounts in the
+        book, joining category_cache to account in one SELECT per IN_CHUNK_SIZE payees.
+        Payees with no entry, or whose account isn't in the book, are omitted.
+        """
+        accounts = {}
+        for chunk in _chunks(set(payee_norms)):
+            stmt = (
+                select(CategoryCache.payee_norm, Account)
+                .join(Account, Account.id == CategoryCache.account_id)
+                .where(CategoryCache.payee_norm.in_(chunk), Account.book_id == book_id)
+            )
+            accounts.update(self.session.execute(stmt).tuples().all())
+        return accounts
+
+    def increment_cache_hits(self, hit_counts: Mapping[str, int]) -> None:
+        """Add hit counts to many cache entries with one executemany UPDATE."""
+        if not hit_counts:
+            return
+        table = CategoryCache.__table__
+        stmt = (
+            update(table)
+            .where(table.c.payee_norm == bindparam('k'))
+            .values(
+                hit_count=table.c.hit_count + bindparam('n'),
+                last_seen_at=datetime.now(),
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        self.session.execute(stmt, [{'k': k, 'n': n} for k, n in hit_counts.items()])
+        self._commit()
+        self._expire_cache_entries(hit_counts)
+
+    def set_category_cache_bulk(self, rows: list[dict]) -> None:
+        """
+        Set many cache entries. Each row has payee_norm, account_id and hit_count;
+        existing entries are repointed and their hit_count increased, the rest inserted.
+        """
+        if not rows:
+            return
+        existing = self.get_categories_from_cache_bulk(r['payee_norm'] for r in rows)
+        new_rows = [r for r in rows if r['payee_norm'] not in existing]
+        if new_rows:
+            self.session.execute(insert(CategoryCache), new_rows)
+        updates = [
+            {'k': r['payee_norm'], 'a': r['account_id'], 'n': r['hit_count']}
+            for r in rows
+            if r['payee_norm'] in existing
+        ]
+        if updates:
+            table = CategoryCache.__table__
+            stmt = (
+                update(table)
+                .where(table.c.payee_norm == bindparam('k'))
+                .values(
+                    account_id=bindparam('a'),
+                    hit_count=table.c.hit_count + bindparam('n'),
+                    last_seen_at=datetime.now(),
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+            self.session.execute(stmt, updates)
+        self._commit()
+        self._expire_cache_entries(existing)
+
+    def _expire_cache_entries(self, payee_norms: Iterable[str]) -> None:
+        """Expire in-session CategoryCache objects changed behind the ORM's back by Core UPDATEs."""
+        for payee_norm in payee_norms:
+            entry = self.session.identity_map.get(identity_key(CategoryCache, payee_norm))
+            if entry is not None:
+                self.session.expire(entry)
 
     # --------------------------------------------------------------------------
     # AccountStatement
@@ -379,7 +668,7 @@ class DAL:
             statement_path=statement_path,
         )
         self.session.add(statement)
-        self.session.commit()
+        self._commit()
         logger.debug(f"Created account statement id={statement.id}")
         return statement
 
@@ -443,7 +732,7 @@ class DAL:
             statement.computed_end_balance = computed_end_balance
             statement.discrepancy = discrepancy
             statement.reconcile_status = reconcile_status
-            self.session.commit()
+            self._commit()
         except Exception as e:
             logger.error(f"Failed to update statement reconciliation: {e}")
             self.session.rollback()
@@ -0,0 +1,100 @@
+# engine.py
+"""Engine construction shared by BaseService and BookContext."""
+
+import atexit
+from logging import getLogger
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+
+from ledger.config import DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_SIZE
+
+logger = getLogger(__name__)
+
+# Rows per multi-row INSERT ... VALUES statement when executemany() is batched
+INSERTMANYVALUES_PAGE_SIZE = 1000
+
+# Compiled-statement cache entries per engine (SQLAlchemy default is 500). The DAL issues
+# a modest number of select() shapes many times over, so every shape should stay cached.
+QUERY_CACHE_SIZE = 1200
+
+# Statements per psycopg2 execute_batch() round trip for UPDATE/DELETE executemany()
+EXECUTEMANY_BATCH_PAGE_SIZE = 500
+
+# One engine (and connection pool) per database URL for the life of the process
+_ENGINE_CACHE: dict[str, Engine] = {}
+
+
+def is_memory_sqlite(db_url: str | URL) -> bool:
+    """Whether db_url names an in-memory SQLite database, private to each engine."""
+    url = make_url(db_url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def create_db_engine(db_url: str) -> Engine:
+    """
+    Create an engine with batched executemany() enabled.
+
+    SQLite connections have foreign key enforcement switched on, which the model's
+    RESTRICT/CASCADE deletes rely on. INSERT executemany() calls are compiled into multi-row INSERT ... VALUES
+    statements on every dialect (SQLAlchemy's insertmanyvalues). For psycopg2 the
+    remaining executemany() statements are also batched via execute_batch(). Pooled
+    engines take their sizing from ledger.config.
+    """
+    url = make_url(db_url)
+    kwargs = {
+        'echo': False,
+        'pool_pre_ping': True,
+        'query_cache_size': QUERY_CACHE_SIZE,
+        'insertmanyvalues_page_size': INSERTMANYVALUES_PAGE_SIZE,
+    }
+    if not is_memory_sqlite(url):
+        kwargs['pool_size'] = DB_POOL_SIZE
+        kwargs['max_overflow'] = DB_MAX_OVERFLOW
+        kwargs['pool_recycle'] = DB_POOL_RECYCLE
+    if url.get_driver_name() == 'psycopg2':
+        kwargs['executemany_mode'] = 'values_plus_batch'
+        kwargs['executemany_batch_page_size'] = EXECUTEMANY_BATCH_PAGE_SIZE
+    logger.debug(f"Creating engine for {url.render_as_string(hide_password=True)}")
+    engine = create_engine(url, **kwargs)
+
+    @event.listens_for(engine, 'connect', once=True)
+    def _log_server_version(dbapi_connection, connection_record):
+        logger.debug(
+            f"Connected to {engine.dialect.name} {engine.dialect.server_version_info}, "
+            f"query_cache_size={QUERY_CACHE_SIZE}"
+        )
+
+    if url.get_backend_name() == 'sqlite':
+
+        @event.listens_for(engine, 'connect')
+        def _enable_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return engine
+
+
+def get_engine(db_url: str) -> Engine:
+    """
+    Return the shared engine for db_url, creating it on first use.
+
+    In-memory SQLite URLs are not cached: each engine is its own private database.
+    """
+    if is_memory_sqlite(db_url):
+        return create_db_engine(db_url)
+    engine = _ENGINE_CACHE.get(db_url)
+    if engine is None:
+        engine = _ENGINE_CACHE[db_url] = create_db_engine(db_url)
+    return engine
+
+
+def dispose_engines():
+    """Close all pooled connections of cached engines. Registered to run at exit."""
+    for engine in _ENGINE_CACHE.values():
+        engine.dispose()
+    _ENGINE_CACHE.clear()
+
+
+atexit.register(dispose_engines)
@@ -1,7 +1,9 @@
 # models.py (excerpt)
+from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     String,
     Boolean,
@@ -12,15 +14,33 @@ from sqlalchemy import (
     Text,
     CheckConstraint,
     UniqueConstraint,
+    Index,
     Integer,
+    Numeric,
+    cast,
     text,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, relationship
 from ledger.db.updated_mixin import UpdatedAtMixin
 
 
 Base = declarative_base()
 
+# Split amounts are stored as integer 1/10000ths, the same scale as the former DECIMAL(20, 4)
+AMOUNT_SCALE = 10000
+
+
+def to_amount_e4(value) -> int:
+    """Convert a Decimal/str/int/float amount into integer 1/10000ths."""
+    scaled = Decimal(str(value)) * AMOUNT_SCALE
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_amount_e4(value: int) -> Decimal:
+    """Convert integer 1/10000ths back into a Decimal with four places."""
+    return Decimal(value).scaleb(-4)
+
 
 class AccountTypeEnum(str, Enum):
     ASSET = "ASSET"
@@ -37,8 +57,9 @@ class Book(Base, UpdatedAtMixin):
     name = Column(String(100), nullable=False, unique=True)
     created_at = Column(DateTime, server_default=text("CURRENT_TIMESTAMP"), nullable=False)
 
-    accounts = relationship("Account", back_populates="book", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="book", cascade="all, delete-orphan")
+    # Deletes are left to the RESTRICT foreign keys rather than walking every row in the ORM
+    accounts = relationship("Account", back_populates="book", passive_deletes=True)
+    transactions = relationship("Transaction", back_populates="book", passive_deletes=True)
     import_files = relationship("ImportFile", back_populates="book", cascade="all, delete-orphan")
     account_statements = relationship(
         "AccountStatement", back_populates="book", cascade="all, delete-orphan"
@@ -72,11 +93,15 @@ class Account(Base, UpdatedAtMixin):
     __table_args__ = (
         CheckConstraint("acct_type IN ('ASSET','LIABILITY','INCOME','EXPENSE','EQUITY','ROOT')"),
         UniqueConstraint('book_id', 'code'),
+        # Point lookups: get_account_by_fullname_for_book and get_account_by_name_for_book
+        Index('ux_account_book_fullname', 'book_id', 'full_name', unique=True),
+        Index('ix_account_book_code_name', 'book_id', 'code', 'name'),
     )
 
     book = relationship("Book", back_populates="accounts")
     parent_account = relationship("Account", remote_side="Account.id", uselist=False)
-    splits = relationship("Split", back_populates="account", cascade="all, delete-orphan")
+    # No ORM delete cascade: deleting an account must never take its split history with it
+    splits = relationship("Split", back_populates="account", passive_deletes=True)
 
     def __str__(self):
         return self.full_name
@@ -120,6 +145,11 @@ class Transaction(Base, UpdatedAtMixin):
     transfer_reference = Column(String(32), nullable=True, index=True)
     # Stores the transaction# from Chase checking transfers (e.g., "11104475445")
 
+    __table_args__ = (
+        # Leading book_id so date-range scans seek into a single book first
+        Index('ix_transactions_book_date', 'book_id', 'transaction_date'),
+    )
+
     book = relationship("Book", back_populates="transactions")
     import_file = relationship("ImportFile", back_populates="transactions")
     splits = relationship("Split", back_populates="transaction", cascade="all, delete-orphan")
@@ -146,21 +176,21 @@ class Transaction(Base, UpdatedAtMixin):
                 f"Transaction {self.id} must have exactly two splits, but has {len(self.splits)}"
             )
 
-        for split in self.splits:
-            # Use cached account if relationship not loaded (for unsaved transactions)
-            acct = getattr(split, '_account_cache', None) or split.account
-            if acct is None:
-                raise CorrespondingSplitNotFoundError(
-                    f"Split {split.id} has no account loaded for transaction {self.id}"
-                )
-            if acct.full_name != candidate.full_name:
-                return (
-                    acct  # Return the account from the split that does not match the given account
-                )
-
-        raise CorrespondingSplitNotFoundError(
-            f"No corresponding split found for account {candidate.id} in transaction {self.id}"
-        )
+        # Probe the first split and fall through to the second; comparing the FK
+        # column means the importing side never loads its Account
+        first, second = self.splits
+        split = second if first.account_id == candidate.id else first
+        if split.account_id == candidate.id:
+            raise CorrespondingSplitNotFoundError(
+                f"No corresponding split found for account {candidate.id} in transaction {self.id}"
+            )
+        # Use cached account if relationship not loaded (for unsaved transactions)
+        acct = getattr(split, '_account_cache', None) or split.account
+        if acct is None:
+            raise CorrespondingSplitNotFoundError(
+                f"Split {split.id} has no account loaded for transaction {self.id}"
+            )
+        return acct  # Return the account from the split that does not match the given account
 
     def __str__(self):
         return f'txn_date: {self.transaction_date}, match_status: {self.match_status}, description: {self.transaction_description}, amount: {self.splits[0].amount}'
@@ -180,7 +210,9 @@ class Split(Base, UpdatedAtMixin):
     account_id = Column(
         Integer, ForeignKey('account.id', ondelete="RESTRICT", onupdate="RESTRICT"), nullable=False
     )
-    amount = Column(DECIMAL(20, 4), nullable=False)  # negative for credits, positive for debits
+    # Fixed point in 1/10000ths of the currency unit (amount * 10^4, hence e4);
+    # negative for credits, positive for debits
+    amount_e4 = Column(BigInteger, nullable=False)
     memo = Column(Text)
     reconcile_date = Column(DateTime)
     reconcile_state = Column(
@@ -191,6 +223,22 @@ class Split(Base, UpdatedAtMixin):
     transaction = relationship("Transaction", back_populates="splits")
     account = relationship("Account", back_populates="splits")
 
+    @hybrid_property
+    def amount(self) -> Decimal | None:
+        """Split amount as a Decimal, converted from the stored integer."""
+        if self.amount_e4 is None:
+            return None
+        return from_amount_e4(self.amount_e4)
+
+    @amount.inplace.setter
+    def _amount_setter(self, value) -> None:
+        self.amount_e4 = None if value is None else to_amount_e4(value)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return cast(cls.amount_e4, Numeric(20, 4)) / AMOUNT_SCALE
+
 
 class ImportFile(Base, UpdatedAtMixin):
     """
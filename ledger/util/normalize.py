@@ -3,8 +3,19 @@
 Utility functions for normalizing transaction data.
 """
 import re
+from functools import lru_cache
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_PPD_ID_RE = re.compile(r'\s+PPD ID:\s*\d+$')
+_TRANSACTION_REF_RE = re.compile(r'\s+TRANSACTION#:\s*\d+.*$', re.IGNORECASE)
+_REFERENCE_NUMBER_RE = re.compile(r'\s+#?\d{6,}$')
+_CARD_NUMBER_RE = re.compile(r'\s+(?:XXXX|\.\.\.)?\d{4}$')
+_TRAILING_DATE_RE = re.compile(r'\s+\d{2}/\d{2}(?:/\d{2,4})?$')
 
+
+# Statements repeat the same descriptions (recurring merchants), so each distinct
+# description is normalized once per process
+@lru_cache(maxsize=4096)
 def normalize_payee(description: str) -> str:
     """
     Normalize a payee description for categorization matching.
@@ -27,22 +38,22 @@ def normalize_payee(description: str) -> str:
     payee = description.upper().strip()
 
     # Collapse multiple whitespace to single space
-    payee = re.sub(r'\s+', ' ', payee)
+    payee = _WHITESPACE_RE.sub(' ', payee)
 
     # Remove trailing transaction numbers (e.g., "PPD ID: 1234567890")
-    payee = re.sub(r'\s+PPD ID:\s*\d+$', '', payee)
+    payee = _PPD_ID_RE.sub('', payee)
 
     # Remove trailing transaction# references (must be before card number strip)
-    payee = re.sub(r'\s+TRANSACTION#:\s*\d+.*$', '', payee, flags=re.IGNORECASE)
+    payee = _TRANSACTION_REF_RE.sub('', payee)
 
     # Remove trailing reference numbers (generic alphanumeric)
-    payee = re.sub(r'\s+#?\d{6,}$', '', payee)
+    payee = _REFERENCE_NUMBER_RE.sub('', payee)
 
     # Remove trailing card numbers (e.g., "XXXX1234" or "...1234")
-    payee = re.sub(r'\s+(?:XXXX|\.\.\.)?\d{4}$', '', payee)
+    payee = _CARD_NUMBER_RE.sub('', payee)
 
     # Remove trailing dates (e.g., "07/14" or "07/14/2024")
-    payee = re.sub(r'\s+\d{2}/\d{2}(?:/\d{2,4})?$', '', payee)
+    payee = _TRAILING_DATE_RE.sub('', payee)
 
     # Strip again after removals
     payee = payee.strip()
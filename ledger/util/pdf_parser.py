@@ -7,7 +7,7 @@ from decimal import Decimal
 from logging import getLogger
 from pathlib import Path
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 import fitz  # PyMuPDF
 
@@ -67,12 +67,35 @@ STATEMENT_PATTERNS = {
 }
 
 
+class SlugInfo(NamedTuple):
+    kind: str
+    institution: str
+    owner: str
+    account_number: str | None
+
+
+# type-institution-owner[-account_number], e.g. 'checking-chase-personal-1381'
+_SLUG_RE = re.compile(r'^([a-z]+)-([a-z]+)-([a-z]+)(?:-(\d+))?$')
+
+
+def parse_slug(account_slug: str) -> SlugInfo | None:
+    """Split an account slug into its components in one pass, or None if malformed."""
+    match = _SLUG_RE.match(account_slug)
+    return SlugInfo(*match.groups()) if match else None
+
+
+def slug_prefix(account_slug: str) -> str | None:
+    """Get the pattern key for a slug ('checking-chase-personal-1381' -> 'checking-chase-personal')."""
+    info = parse_slug(account_slug)
+    return f"{info.kind}-{info.institution}-{info.owner}" if info else None
+
+
 def get_patterns(account_slug: str) -> dict:
     """Get patterns for an account slug (e.g., 'checking-chase-personal-1381')."""
-    for key in STATEMENT_PATTERNS:
-        if account_slug.startswith(key):
-            return STATEMENT_PATTERNS[key]
-    raise StatementParseError(f"No parser pattern found for account: {account_slug}")
+    patterns = STATEMENT_PATTERNS.get(slug_prefix(account_slug))
+    if patterns is None:
+        raise StatementParseError(f"No parser pattern found for account: {account_slug}")
+    return patterns
 
 
 class StatementPdfParser:
@@ -152,10 +175,10 @@ class StatementPdfParser:
         $3,207.34        <- ending balance
         """
         # Extract account number suffix (e.g., "1381" from "checking-chase-personal-1381")
-        parts = account_slug.split('-')
-        if len(parts) < 4 or not parts[-1].isdigit():
+        info = parse_slug(account_slug)
+        if not info or not info.account_number:
             raise StatementParseError(f"Cannot extract account number from slug: {account_slug}")
-        acct_num_suffix = parts[-1]
+        acct_num_suffix = info.account_number
 
         # Find the account entry in Consolidated Balance Summary
         # Pattern: account number followed by two balance amounts on separate lines
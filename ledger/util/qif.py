@@ -1,10 +1,9 @@
-from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from decimal import Decimal
 from logging import getLogger
 
-from ledger.db.models import Transaction, Split, Account
+from ledger.db.models import Transaction, Split, Account, to_amount_e4
 from ledger.util.normalize import normalize_payee
 from ledger.util.transfer import extract_transfer_reference
 
@@ -23,8 +22,6 @@ TxnAmount = 'T'
 TxnCategory = 'L'
 RecordEnd = '^'
 
-NEG_ONE = Decimal("-1")
-
 DATE_FORMATS = ["%m/%d/%Y", "%m-%d-%Y"]
 
 
@@ -43,34 +40,33 @@ def parse_qif_date(date_str: str):
 
 class Qif:
     def __init__(self):
-        self.account_info = OrderedDict()
+        self.account_info = {}
         self.transaction_type = None
-        self.transactions = []  # list[Transaction]
+        self.transactions = []  # list[dict], one record per transaction keyed by field code
 
     def init_from_qif_file(self, qif_file):
         logger.debug(f"Reading QIF file: {qif_file}")
         with open(qif_file, 'r') as file:
-            data = file.readlines()
-        logger.debug(f"Read {len(data)} lines from file")
-        return self.init_from_qif_data(data)
+            return self.init_from_qif_data(file)
 
     def init_from_qif_data(self, qif_data):
+        """
+        Parse QIF lines in a single pass.
+
+        Each line is dispatched on its first character; records are plain dicts
+        keyed by field code and are appended as-is when the record end marker is seen.
+        """
         logger.debug("Parsing QIF data")
         in_account_section = False
-        current_transaction = OrderedDict()
+        transactions = self.transactions
+        current_transaction = {}
         for line in qif_data:
             line = line.strip()
             if not line:
                 continue
 
-            if line == AcctHeader:
-                in_account_section = True
-                self.account_info = OrderedDict()
-                self.account_info[line] = ''
-            elif line.startswith(TxnHeader):
-                self.transaction_type = line.split(':')[1]
-                logger.debug(f"Transaction type: {self.transaction_type}")
-            elif line == RecordEnd:  # end of section or transaction
+            line_type = line[0]
+            if line == RecordEnd:  # end of section or transaction
                 if in_account_section:
                     self.account_info[RecordEnd] = ''
                     in_account_section = False
@@ -79,109 +75,112 @@ class Qif:
                     )
                 else:
                     current_transaction[RecordEnd] = ''
-                    self.transactions.append(current_transaction)
-                    current_transaction = OrderedDict()
+                    transactions.append(current_transaction)
+                    current_transaction = {}
+            elif line_type == '!' and line == AcctHeader:
+                in_account_section = True
+                self.account_info = {line: ''}
+            elif line_type == '!' and line.startswith(TxnHeader):
+                self.transaction_type = line.split(':')[1]
+                logger.debug(f"Transaction type: {self.transaction_type}")
+            elif in_account_section:
+                self.account_info[line_type] = line[1:].strip()
             else:
-                line_type = line[0]
                 line_data = line[1:].strip()
-                if in_account_section:
-                    self.account_info[line_type] = line_data
-                else:
-                    current_transaction[line_type] = line_data
-                    if line_type == TxnPayee:
-                        current_transaction[TxnPayeeNorm] = normalize_payee(line_data)
+                current_transaction[line_type] = line_data
+                if line_type == TxnPayee:
+                    current_transaction[TxnPayeeNorm] = normalize_payee(line_data)
 
-        logger.debug(f"Parsed {len(self.transactions)} transactions")
+        logger.debug(f"Parsed {len(transactions)} transactions")
         return self
 
     def account(self) -> str:
         return self.account_info[AcctName]
 
     @staticmethod
-    def get_category(txn: OrderedDict) -> str:
+    def get_category(txn: dict) -> str:
         if TxnCategory in txn and txn[TxnCategory] and txn[TxnCategory].strip():
             return txn[TxnCategory]
         else:
             return None
 
     @staticmethod
-    def set_category(txn: OrderedDict, category_account: str) -> None:
+    def set_category(txn: dict, category_account: str) -> None:
         if category_account:
             txn[TxnCategory] = category_account
 
     @staticmethod
-    def payee(txn: OrderedDict) -> str:
+    def payee(txn: dict) -> str:
         return txn.get(TxnPayee)
 
     @staticmethod
-    def normalized_payee(txn: OrderedDict) -> str:
+    def normalized_payee(txn: dict) -> str:
         return txn[TxnPayeeNorm]
 
-    def as_transaction_data(self, book_id):
-        """Convert QIF data to transaction data with account names (not objects)"""
-        from_account = self.account_info[AcctName]
-        transaction_data = []
-        for txn in self.transactions:
-            txn_date = parse_qif_date(txn.get(TxnDate))
-            txn_amount = Decimal(txn.get(TxnAmount).strip())
-
-            data = {
-                'book_id': book_id,
-                'transaction_date': txn_date,
-                'transaction_description': txn.get(TxnPayee),
-                'payee_norm': txn.get(TxnPayeeNorm),
-                'splits': [
-                    {'account_name': from_account, 'amount': txn_amount},
-                    {'account_name': txn.get(TxnCategory), 'amount': txn_amount * NEG_ONE},
-                ],
-            }
-            transaction_data.append(data)
-        return transaction_data
-
-    def as_transactions(self, book_id: int, resolve_account: Callable[[str], Account]) -> list:
+    def iter_transactions(
+        self, book_id: int, resolve_account: Callable[[str], Account]
+    ) -> Iterator[Transaction]:
         """
-        Convert QIF data to Transaction objects.
+        Yield Transaction objects for the QIF records one at a time.
+
+        Each record is converted straight from its field dict, so no intermediate
+        per-record data is kept and callers can consume the objects as a stream.
 
         Args:
             book_id: Book ID for the transactions
             resolve_account: Callback (account_name) -> Account
 
-        Returns:
-            List of Transaction objects with resolved accounts
+        Yields:
+            Transaction objects with resolved accounts
         """
-        logger.debug(f"Converting {len(self.transactions)} QIF records to Transaction objects")
-        transaction_data = self.as_transaction_data(book_id)
-        transactions = []
+        from_account_name = self.account_info[AcctName]
+        for txn in self.transactions:
+            txn_amount = Decimal(txn.get(TxnAmount).strip())
+            amount_e4 = to_amount_e4(txn_amount)
+            description = txn.get(TxnPayee)
 
-        for data in transaction_data:
             transaction = Transaction()
-            transaction.book_id = data['book_id']
-            transaction.transaction_date = data['transaction_date']
-            transaction.transaction_description = data['transaction_description']
-            transaction.payee_norm = data['payee_norm']
+            transaction.book_id = book_id
+            transaction.transaction_date = parse_qif_date(txn.get(TxnDate))
+            transaction.transaction_description = description
+            transaction.payee_norm = txn.get(TxnPayeeNorm)
 
             # Extract transfer_reference from Chase checking transfer descriptions
-            transaction.transfer_reference = extract_transfer_reference(
-                data['transaction_description']
-            )
+            transaction.transfer_reference = extract_transfer_reference(description)
 
             transaction.splits = []
-            for split_data in data['splits']:
+            for account_name, split_amount_e4 in (
+                (from_account_name, amount_e4),
+                (txn.get(TxnCategory), -amount_e4),
+            ):
                 split = Split()
-                account = resolve_account(split_data['account_name'])
+                account = resolve_account(account_name)
                 if not account:
-                    logger.error(f"Account '{split_data['account_name']}' not found")
-                    raise ValueError(f"Account '{split_data['account_name']}' not found")
+                    logger.error(f"Account '{account_name}' not found")
+                    raise ValueError(f"Account '{account_name}' not found")
                 # Only set account_id (foreign key), NOT account (relationship)
                 # Setting split.account triggers bidirectional relationship which causes
                 # SAWarning when Split is not yet in session
                 split.account_id = account.id
                 # Store account as transient attribute for matching (not persisted)
                 split._account_cache = account
-                split.amount = split_data['amount']
+                split.amount_e4 = split_amount_e4
                 transaction.splits.append(split)
 
-            transactions.append(transaction)
+            yield transaction
+
+    def as_transactions(self, book_id: int, resolve_account: Callable[[str], Account]) -> list:
+        """
+        Convert QIF data to Transaction objects.
+
+        Args:
+            book_id: Book ID for the transactions
+            resolve_account: Callback (account_name) -> Account
 
+        Returns:
+            List of Transaction objects with resolved accounts
+        """
+        logger.debug(f"Converting {len(self.transactions)} QIF records to Transaction objects")
+        transactions = list(self.iter_transactions(book_id, resolve_account))
         logger.debug(f"Created {len(transactions)} Transaction objects")
         return transactions
@@ -5,11 +5,14 @@ Convention: {year}/{account_slug}/{from_date}--{to_date}-{account_slug}.{ext}
 Example: 2023/creditcard-chase-personal-6063/2022-12-29--2023-01-28-creditcard-chase-personal-6063.pdf
 """
 
-from dataclasses import dataclass
-from datetime import datetime, date
+from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
 import re
 
+_FILENAME_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})--(\d{4}-\d{2}-\d{2})-(.+)$')
+_YEAR_RE = re.compile(r'^\d{4}$')
+
 
 @dataclass(frozen=True)
 class AccountUri:
@@ -21,11 +24,16 @@ class AccountUri:
     """
 
     path: Path
+    # Parsed once in __post_init__; the properties below read from it
+    _components: tuple[str, str, date, date] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate the path format during initialization."""
-        if not self.is_valid_path():
+        try:
+            components = self.parse_components()
+        except (ValueError, IndexError, AttributeError):
             raise ValueError(f"Invalid path format: {self.path}")
+        object.__setattr__(self, '_components', components)
 
     def is_valid_path(self) -> bool:
         """Validate that the path matches expected format."""
@@ -42,19 +50,19 @@ class AccountUri:
             raise ValueError("Path must have at least 3 components (year/account/filename)")
 
         year, account_slug, filename = parts[-3], parts[-2], parts[-1]
-        match = re.match(r'^(\d{4}-\d{2}-\d{2})--(\d{4}-\d{2}-\d{2})-(.+)$', filename)
+        match = _FILENAME_RE.match(filename)
         if not match:
             raise ValueError(f"Filename does not match expected format: {filename}")
 
         from_date_str, to_date_str, filename_account_slug = match.groups()
         if filename_account_slug != account_slug:
             raise ValueError(f"Account slug mismatch: {filename_account_slug} != {account_slug}")
-        if not re.match(r'^\d{4}$', year):
+        if not _YEAR_RE.match(year):
             raise ValueError(f"Invalid year format: {year}")
 
         try:
-            from_date = datetime.strptime(from_date_str, '%Y-%m-%d').date()
-            to_date = datetime.strptime(to_date_str, '%Y-%m-%d').date()
+            from_date = date.fromisoformat(from_date_str)
+            to_date = date.fromisoformat(to_date_str)
         except ValueError as e:
             raise ValueError(f"Invalid date format: {e}")
 
@@ -63,22 +71,22 @@ class AccountUri:
     @property
     def year(self) -> int:
         """Get the year component as an integer."""
-        return int(self.parse_components()[0])
+        return int(self._components[0])
 
     @property
     def account_slug(self) -> str:
         """Get the account slug component."""
-        return self.parse_components()[1]
+        return self._components[1]
 
     @property
     def from_date(self) -> date:
         """Get the from date as a date object."""
-        return self.parse_components()[2]
+        return self._components[2]
 
     @property
     def to_date(self) -> date:
         """Get the to date as a date object."""
-        return self.parse_components()[3]
+        return self._components[3]
 
     def pdf(self) -> Path:
         """Get the path to the PDF file."""
@@ -105,7 +113,7 @@ class AccountUri:
         cls, year: int, account_slug: str, from_date: date, to_date: date
     ) -> 'AccountUri':
         """Create an AccountUri from individual components."""
-        if not re.match(r'^\d{4}$', str(year)):
+        if not _YEAR_RE.match(str(year)):
             raise ValueError(f"Invalid year format: {year}")
 
         path_str = (
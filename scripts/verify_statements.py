@@ -23,7 +23,7 @@ from ledger.business.book_context import BookContext
 from ledger.business.statement_service import ImportResult
 from ledger.db.models import Base
 from ledger.util.statement_uri import AccountUri
-from ledger.util.pdf_parser import StatementParseError, STATEMENT_PATTERNS
+from ledger.util.pdf_parser import StatementParseError, STATEMENT_PATTERNS, slug_prefix
 
 
 class ResultStatus(str, Enum):
@@ -70,10 +70,7 @@ def get_supported_account_prefixes() -> set[str]:
 
 def is_supported_account(account_slug: str, supported_prefixes: set[str]) -> bool:
     """Check if account slug matches a supported parser pattern."""
-    for prefix in supported_prefixes:
-        if account_slug.startswith(prefix):
-            return True
-    return False
+    return slug_prefix(account_slug) in supported_prefixes
 
 
 def find_pdf_files(test_files_dir: Path) -> list[Path]:
@@ -281,8 +278,8 @@ def main():
     print_summary(report)
 
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(asdict(report), f, indent=2)
+        # Encode once and write in a single call; json.dump would issue a write per token
+        args.output.write_bytes(json.dumps(asdict(report), indent=2).encode("utf-8"))
         print(f"Detailed results written to: {args.output}")
 
     sys.exit(0 if report.parse_error == 0 and report.import_error == 0 else 1)
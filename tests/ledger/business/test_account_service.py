@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import MagicMock
 
-from ledger.business.account_service import AccountService
+from ledger.business.account_service import AccountNotFound, AccountService
 
 
 @pytest.fixture
@@ -17,7 +17,7 @@ def test_list_accounts(account_service, mock_dal):
     accounts = account_service.list_accounts()
 
     assert accounts == []
-    mock_dal.list_accounts_for_book.assert_called_once_with(1)
+    mock_dal.list_accounts_for_book.assert_called_once_with(1, with_splits=False)
 
 
 def test_add_account(account_service, mock_dal):
@@ -60,6 +60,45 @@ def test_add_account_with_parent(account_service, mock_dal):
     mock_dal.get_account_by_name_for_book.assert_called_once_with(1, "ROOT", "Root Account")
 
 
+def _account_row(code, name, parent_code=None, parent_name=None):
+    return dict(
+        parent_code=parent_code,
+        parent_name=parent_name,
+        acct_name=name,
+        full_name=name,
+        acct_code=code,
+        acct_type="ASSET",
+    )
+
+
+def test_add_accounts_resolves_parents_once(account_service, mock_dal):
+    """Test bulk adding accounts resolves all parents with a single lookup."""
+    mock_dal.get_accounts_by_name_pairs_for_book.return_value = {("100", "Assets"): MagicMock(id=7)}
+    mock_dal.create_accounts.side_effect = lambda accts: accts
+
+    rows = [
+        _account_row("101", "Checking", "100", "Assets"),
+        _account_row("102", "Savings", "100", "Assets"),
+        _account_row("200", "Liabilities"),
+    ]
+    created = account_service.add_accounts(rows)
+
+    mock_dal.get_accounts_by_name_pairs_for_book.assert_called_once_with(1, {("100", "Assets")})
+    mock_dal.get_account_by_name_for_book.assert_not_called()
+    assert [a.parent_account_id for a in created] == [7, 7, None]
+    assert all(a.book_id == 1 for a in created)
+
+
+def test_add_accounts_parent_not_found(account_service, mock_dal):
+    """Test bulk adding accounts fails when a parent is missing."""
+    mock_dal.get_accounts_by_name_pairs_for_book.return_value = {}
+
+    with pytest.raises(AccountNotFound, match="Parent account named 'Assets' not found"):
+        account_service.add_accounts([_account_row("101", "Checking", "100", "Assets")])
+
+    mock_dal.create_accounts.assert_not_called()
+
+
 def test_lookup_by_name(account_service, mock_dal):
     """Test looking up account by name."""
     mock_account = MagicMock(id=10, full_name="Assets:Checking")
@@ -77,8 +116,10 @@ def test_lookup_by_name_not_found(account_service, mock_dal):
     """Test looking up account that doesn't exist."""
     mock_dal.get_account_by_fullname_for_book.return_value = None
 
-    with pytest.raises(Exception, match="No account found"):
+    with pytest.raises(AccountNotFound, match="No account found") as exc_info:
         account_service.lookup_by_name("Nonexistent:Account")
+    assert isinstance(exc_info.value, LookupError)
+    assert exc_info.value.args[0] == "Nonexistent:Account"
 
 
 def test_lookup_by_id(account_service, mock_dal):
@@ -90,3 +131,84 @@ def test_lookup_by_id(account_service, mock_dal):
 
     assert result.id == 10
     mock_dal.get_account.assert_called_once_with(account_id=10)
+
+
+def test_lookups_are_cached(account_service, mock_dal):
+    """Test repeated lookups hit the per-context cache, by name or by id."""
+    mock_account = MagicMock(id=10, full_name="Assets:Checking")
+    mock_dal.get_account_by_fullname_for_book.return_value = mock_account
+
+    assert account_service.lookup_by_name("Assets:Checking") is mock_account
+    assert account_service.lookup_by_name("Assets:Checking") is mock_account
+    assert account_service.lookup_by_id(10) is mock_account
+
+    mock_dal.get_account_by_fullname_for_book.assert_called_once()
+    mock_dal.get_account.assert_not_called()
+
+
+def test_added_account_is_cached(account_service, mock_dal):
+    """Test an account added in this context is found without a query."""
+    mock_dal.create_account.return_value = MagicMock(id=3, full_name="Assets:New")
+
+    account_service.add_account(None, None, "New", "Assets:New", "003", "ASSET", "", False, False)
+
+    assert account_service.lookup_by_name("Assets:New").id == 3
+    mock_dal.get_account_by_fullname_for_book.assert_not_called()
+
+
+def test_prefetched_accounts_skip_queries(mock_dal, mock_book):
+    """Test a service built from prefetched indexes answers lookups from them."""
+    checking = MagicMock(id=10, full_name="Assets:Checking")
+    service = AccountService(
+        mock_dal,
+        mock_book,
+        name_index={"Assets:Checking": checking},
+        id_index={10: checking},
+    )
+
+    assert service.lookup_by_name("Assets:Checking") is checking
+    assert service.lookup_by_id(10) is checking
+    assert service.list_accounts() == [checking]
+    assert service.accounts_by_full_name() == {"Assets:Checking": checking}
+    mock_dal.get_account_by_fullname_for_book.assert_not_called()
+    mock_dal.get_account.assert_not_called()
+    mock_dal.list_accounts_for_book.assert_not_called()
+    mock_dal.accounts_by_full_name.assert_not_called()
+
+
+def test_accounts_by_full_name(account_service, mock_dal):
+    """Test loading all accounts keyed by full name."""
+    mock_account = MagicMock(id=10, full_name="Assets:Checking")
+    mock_dal.accounts_by_full_name.return_value = {"Assets:Checking": mock_account}
+
+    result = account_service.accounts_by_full_name()
+
+    assert result == {"Assets:Checking": mock_account}
+    mock_dal.accounts_by_full_name.assert_called_once_with(1)
+
+
+def test_bulk_lookups_query_only_misses(account_service, mock_dal):
+    """Test lookup_by_ids/lookup_by_names query once for uncached keys and omit unknowns."""
+    checking = MagicMock(id=10, full_name="Assets:Checking")
+    savings = MagicMock(id=11, full_name="Assets:Savings")
+    mock_dal.get_account_by_fullname_for_book.return_value = checking
+    account_service.lookup_by_name("Assets:Checking")
+    mock_dal.get_accounts_by_ids.return_value = [savings]
+    mock_dal.get_accounts_by_fullnames_for_book.return_value = []
+
+    assert account_service.lookup_by_ids([10, 11, 12]) == {10: checking, 11: savings}
+    mock_dal.get_accounts_by_ids.assert_called_once_with({11, 12})
+
+    assert account_service.lookup_by_names(["Assets:Savings", "Assets:Missing"]) == {
+        "Assets:Savings": savings
+    }
+    mock_dal.get_accounts_by_fullnames_for_book.assert_called_once_with(1, {"Assets:Missing"})
+
+
+def test_find_returns_none_when_missing(account_service, mock_dal):
+    """Test find_by_name/find_by_id return None instead of raising."""
+    mock_dal.get_account_by_fullname_for_book.return_value = None
+    mock_dal.get_account.return_value = None
+
+    assert account_service.find_by_name("Assets:Missing") is None
+    assert account_service.find_by_id(99) is None
@@ -0,0 +1,127 @@
+"""Tests for BookContext."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from ledger.business.book_context import BookContext, clear_book_cache
+from ledger.business.book_service import BookService
+from ledger.business.management_service import ManagementService
+from ledger.db.data_access import DAL
+from ledger.db.engine import get_engine
+from ledger.db.models import Base, Book
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ctx.db'}"
+    with ManagementService().init_with_url(url) as mgmt:
+        mgmt.reset_database()
+    with BookService().init_with_url(url) as book_service:
+        book_service.create_new_book("ctx-book")
+    yield url
+    clear_book_cache()
+
+
+def test_book_lookup_is_cached_across_contexts(db_url):
+    with patch.object(DAL, 'get_book_by_name', wraps=DAL.get_book_by_name, autospec=True) as spy:
+        with BookContext("ctx-book", db_url) as ctx:
+            first_id = ctx.book.id
+        with BookContext("ctx-book", db_url) as ctx:
+            assert ctx.book.id == first_id
+            assert ctx.book.name == "ctx-book"
+            assert ctx.book.created_at is not None
+
+    assert spy.call_count == 1
+
+
+def test_in_memory_books_are_not_cached():
+    url = "sqlite:///:memory:"
+    first = get_engine(url)
+    Base.metadata.create_all(first)
+    with Session(first) as session:
+        session.add(Book(name="mem-book"))
+        session.commit()
+    with patch('ledger.business.session_scope.get_engine', return_value=first):
+        with BookContext("mem-book", url) as ctx:
+            assert ctx.book.name == "mem-book"
+
+    # A second in-memory database has the schema but not the book
+    second = get_engine(url)
+    Base.metadata.create_all(second)
+    try:
+        with patch('ledger.business.session_scope.get_engine', return_value=second):
+            with pytest.raises(ValueError, match="not found"):
+                with BookContext("mem-book", url):
+                    pass
+    finally:
+        first.dispose()
+        second.dispose()
+
+
+def test_missing_book_is_not_cached(db_url):
+    with pytest.raises(ValueError, match="not found"):
+        with BookContext("no-such-book", db_url):
+            pass
+
+    with BookService().init_with_url(db_url) as book_service:
+        book_service.create_new_book("no-such-book")
+
+    with BookContext("no-such-book", db_url) as ctx:
+        assert ctx.book.name == "no-such-book"
+
+
+def test_reset_database_clears_cache(db_url):
+    with BookContext("ctx-book", db_url):
+        pass
+
+    with ManagementService().init_with_url(db_url) as mgmt:
+        mgmt.reset_database()
+
+    with pytest.raises(ValueError, match="not found"):
+        with BookContext("ctx-book", db_url):
+            pass
+
+
+def test_before_commit_callbacks_run_only_on_clean_exit(db_url):
+    calls = []
+    with BookContext("ctx-book", db_url) as ctx:
+        ctx.before_commit(lambda: calls.append("clean"))
+    assert calls == ["clean"]
+
+    with pytest.raises(RuntimeError):
+        with BookContext("ctx-book", db_url) as ctx:
+            ctx.before_commit(lambda: calls.append("failed"))
+            raise RuntimeError("boom")
+    assert calls == ["clean"]
+
+
+def test_services_are_built_on_first_use(db_url):
+    ctx = BookContext("ctx-book", db_url)
+    with pytest.raises(RuntimeError, match="not entered"):
+        ctx.accounts
+
+    with patch.object(DAL, 'list_accounts_for_book', autospec=True, return_value=[]) as spy:
+        with ctx:
+            ctx.transactions
+            spy.assert_not_called()
+            assert ctx.accounts is ctx.accounts
+        spy.assert_called_once()
+
+
+def test_prefetched_accounts_load_relationships(db_url):
+    with BookContext("ctx-book", db_url) as ctx:
+        assets = ctx.accounts.add_account(
+            None, None, "Assets", "Assets", "100", "ASSET", "", False, True
+        )
+        ctx.accounts.add_account(
+            "100", "Assets", "Cash", "Assets:Cash", "101", "ASSET", "", False, False
+        )
+
+    with BookContext("ctx-book", db_url) as ctx:
+        cash = ctx.accounts.lookup_by_name("Assets:Cash")
+        assert cash.parent_account.full_name == "Assets"
+        assert cash.splits == []
+        assert cash.book.name == "ctx-book"
+        assert cash.parent_account_id == assets.id
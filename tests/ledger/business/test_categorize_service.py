@@ -4,17 +4,25 @@ import pytest
 import tempfile
 import os
 import json
+import re
 from unittest.mock import MagicMock
 
 from ledger.business.categorize_service import (
     CategorizeService,
     CategoryRules,
+    _anchored_first_char,
+    get_category_rules,
 )
 
 
 class TestCategoryRules:
     """Tests for CategoryRules rule matching."""
 
+    @pytest.fixture
+    def regex_only(self, monkeypatch):
+        """Match through the combined regex even when pyahocorasick is installed."""
+        monkeypatch.setattr('ledger.business.categorize_service.ahocorasick', None)
+
     @pytest.fixture
     def rules_file(self):
         rules = {
@@ -72,6 +80,140 @@ class TestCategoryRules:
         assert "Expenses:Food:Groceries" in categories
         assert "Expenses:Transportation:Gas" in categories
 
+    def test_match_prefers_rule_order_over_position(self, rules_file, regex_only):
+        # SHELL appears first in the payee but Groceries rules come first in the file
+        rules = CategoryRules(rules_file)
+        assert rules._combined is not None
+        assert rules.match("SHELL STATION WHOLE FOODS") == "Expenses:Food:Groceries"
+        assert rules.match("PAYMENT EXXON") == "Expenses:Transportation:Gas"
+
+    def test_match_with_literal_automaton(self, rules_file):
+        pytest.importorskip('ahocorasick')
+        rules = CategoryRules(rules_file)
+        assert rules._automaton is not None
+        assert rules.match("SHELL STATION WHOLE FOODS") == "Expenses:Food:Groceries"
+        assert rules.match("TRADER JOES SHELL") == "Expenses:Food:Groceries"
+        assert rules.match("AUTOMATIC PAYMENT - THANK") == (
+            "Assets:Checking Accounts:checking-chase-personal-1381"
+        )
+        assert rules.match("NOTHING HERE") is None
+
+    def test_literal_automaton_agrees_with_regex(self, monkeypatch, tmp_path):
+        pytest.importorskip('ahocorasick')
+        rules_path = tmp_path / 'rules.json'
+        rules_path.write_text(
+            json.dumps(
+                {
+                    "Expenses:Food": [
+                        {"payee": "Whole Foods", "type": "literal"},
+                        {"payee": "STRASSE", "type": "literal"},
+                        {"payee": "CAFÉ", "type": "literal"},
+                    ],
+                    "Expenses:Shopping": [
+                        {"payee": "SHOP", "type": "literal"},
+                        {"payee": "^KIOSK", "type": "regex"},
+                        {"payee": "MARKET", "type": "literal"},
+                    ],
+                }
+            )
+        )
+        payees = [
+            "WHOLE FOODS MARKET",
+            "whole foods",
+            "MARKET SHOP",
+            "STRASSE CAFE",
+            "STRAßE",
+            "café du monde",
+            "ſHOP",
+            "KIOSK 12",
+            "\u212aIOSK 12",
+            "NOTHING",
+        ]
+
+        automaton = CategoryRules(str(rules_path))
+        assert automaton._automaton is not None
+        monkeypatch.setattr('ledger.business.categorize_service.ahocorasick', None)
+        regex = CategoryRules(str(rules_path))
+        assert regex._automaton is None
+
+        assert [automaton.match(p) for p in payees] == [regex.match(p) for p in payees]
+
+    def test_anchored_rules_only_scanned_for_their_first_char(self, rules_file, regex_only):
+        rules = CategoryRules(rules_file)
+        assert set(rules._combined_by_first) == {'t', 'a'}
+        assert "TRADER" not in rules._combined.pattern
+        assert rules.match("trader joes #552") == "Expenses:Food:Groceries"
+        assert rules.match("POS TRADER JOES") is None
+        assert rules.match("TARGET SHELL") == "Expenses:Transportation:Gas"
+
+    @pytest.mark.parametrize(
+        'pattern, first',
+        [
+            ('^TRADER JOE', 't'),
+            ('^7-ELEVEN', '7'),
+            ('^A+B', 'a'),
+            ('TRADER', None),
+            ('^T*RADER', None),
+            ('^T?X', None),
+            ('^T{0,1}X', None),
+            ('^TRADER|WHOLE', None),
+            ('^(TRADER)', None),
+            (r'^\d+', None),
+            ('^.X', None),
+            ('^', None),
+        ],
+    )
+    def test_anchored_first_char(self, pattern, first):
+        assert _anchored_first_char(re.compile(pattern, re.IGNORECASE)) == first
+
+    def test_match_is_memoized(self, rules_file):
+        rules = CategoryRules(rules_file)
+        assert rules.match("SHELL OIL") == "Expenses:Transportation:Gas"
+        assert rules.match("SHELL OIL") == "Expenses:Transportation:Gas"
+        assert rules._match_cached.cache_info().hits == 1
+
+    def test_match_with_capturing_groups_in_rules(self):
+        rules = {
+            "Expenses:Coffee": [{"payee": "(STAR)(BUCKS)", "type": "regex"}],
+            "Expenses:Fuel": [{"payee": "(SHELL|(EXXON))", "type": "regex"}],
+            "Expenses:Other": [{"payee": "OTHER", "type": "literal"}],
+        }
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(rules, f)
+        try:
+            category_rules = CategoryRules(f.name)
+            assert category_rules._combined is not None
+            assert category_rules.match("STARBUCKS #12") == "Expenses:Coffee"
+            assert category_rules.match("POS EXXON 99") == "Expenses:Fuel"
+            assert category_rules.match("THE OTHER ONE") == "Expenses:Other"
+            assert category_rules.match("STAR MARKET") is None
+        finally:
+            os.unlink(f.name)
+
+    def test_match_falls_back_when_patterns_cannot_combine(self):
+        rules = {
+            "Expenses:Other": [{"payee": "OTHER", "type": "literal"}],
+            "Expenses:Repeat": [{"payee": "(AB)\\1", "type": "regex"}],
+        }
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(rules, f)
+        try:
+            category_rules = CategoryRules(f.name)
+            assert category_rules._combined is None
+            assert category_rules.match("XABAB") == "Expenses:Repeat"
+            assert category_rules.match("THE OTHER ONE") == "Expenses:Other"
+            assert category_rules.match("ABAC") is None
+        finally:
+            os.unlink(f.name)
+
+    def test_rules_are_shared_until_file_changes(self, rules_file):
+        first = get_category_rules(rules_file)
+        assert get_category_rules(rules_file) is first
+
+        stat = os.stat(rules_file)
+        os.utime(rules_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert get_category_rules(rules_file) is not first
+
     def test_missing_rules_file(self):
         rules = CategoryRules('/nonexistent/path.json')
         assert rules.rules == {}
@@ -97,14 +239,12 @@ class TestCategorizeServiceLookup:
     def test_tier1_cache_hit(self, rules_file, mock_ctx):
         """Tier 1: Cache hit should be returned first."""
         # Mock cache hit
-        mock_cache = MagicMock()
-        mock_cache.account_id = 10
-        mock_ctx.dal.get_category_from_cache.return_value = mock_cache
+        mock_ctx.dal.get_category_cache_map.return_value = {"WHOLE FOODS": 10}
 
         mock_account = MagicMock()
         mock_account.id = 10
         mock_account.full_name = "Expenses:Food:Groceries"
-        mock_ctx.accounts.lookup_by_id.return_value = mock_account
+        mock_ctx.accounts.find_by_id.return_value = mock_account
 
         service = CategorizeService(mock_ctx, rules_path=rules_file)
         result = service.lookup_category_for_payee("WHOLE FOODS")
@@ -113,17 +253,27 @@ class TestCategorizeServiceLookup:
         category, source = result
         assert category == "Expenses:Food:Groceries"
         assert source == 'cache'
-        mock_ctx.dal.increment_cache_hit.assert_called_once_with("WHOLE FOODS")
+        # Hits are buffered until the context commits
+        mock_ctx.before_commit.assert_called_once_with(service.flush_cache_hits)
+        mock_ctx.dal.increment_cache_hits.assert_not_called()
+        # Repeat hits share one result tuple
+        assert service.lookup_category_for_payee("WHOLE FOODS") is result
+        service.flush_cache_hits()
+        mock_ctx.dal.increment_cache_hits.assert_called_once_with({"WHOLE FOODS": 2})
+        mock_ctx.dal.increment_cache_hit.assert_not_called()
+        # The whole cache is loaded once; later lookups don't query it
+        mock_ctx.dal.get_category_cache_map.assert_called_once()
+        mock_ctx.dal.get_category_from_cache.assert_not_called()
 
     def test_tier2_rule_match(self, rules_file, mock_ctx):
         """Tier 2: Rules should be checked if no cache hit."""
         # No cache hit
-        mock_ctx.dal.get_category_from_cache.return_value = None
+        mock_ctx.dal.get_category_cache_map.return_value = {}
 
         mock_account = MagicMock()
         mock_account.id = 10
         mock_account.full_name = "Expenses:Food:Groceries"
-        mock_ctx.accounts.lookup_by_name.return_value = mock_account
+        mock_ctx.accounts.find_by_name.return_value = mock_account
 
         service = CategorizeService(mock_ctx, rules_path=rules_file)
         result = service.lookup_category_for_payee("WHOLE FOODS MARKET")
@@ -138,15 +288,27 @@ class TestCategorizeServiceLookup:
     def test_tier3_no_match_returns_none(self, rules_file, mock_ctx):
         """Tier 3: Returns None when no cache or rule matches."""
         # No cache hit
-        mock_ctx.dal.get_category_from_cache.return_value = None
+        mock_ctx.dal.get_category_cache_map.return_value = {}
         # No rule match account found
-        mock_ctx.accounts.lookup_by_name.side_effect = Exception("Not found")
+        mock_ctx.accounts.find_by_name.return_value = None
 
         service = CategorizeService(mock_ctx, rules_path=rules_file)
         result = service.lookup_category_for_payee("RANDOM UNKNOWN VENDOR")
 
         assert result is None
 
+    def test_known_miss_skips_cache_and_rules(self, rules_file, mock_ctx):
+        """A payee that matched nothing is not looked up again by the same service."""
+        mock_ctx.dal.get_category_cache_map.return_value = {}
+
+        service = CategorizeService(mock_ctx, rules_path=rules_file)
+        assert service.lookup_category_for_payee("RANDOM UNKNOWN VENDOR") is None
+        assert service.lookup_category_for_payee("RANDOM UNKNOWN VENDOR") is None
+        assert service.lookup_categories_for_payees(["RANDOM UNKNOWN VENDOR"]) == {}
+
+        mock_ctx.dal.get_category_cache_map.assert_called_once()
+        mock_ctx.dal.get_cached_category_accounts.assert_not_called()
+
     def test_empty_payee_returns_none(self, rules_file, mock_ctx):
         """Empty or None payee should return None."""
         service = CategorizeService(mock_ctx, rules_path=rules_file)
@@ -156,34 +318,74 @@ class TestCategorizeServiceLookup:
 
     def test_update_cache_false_skips_cache_update(self, rules_file, mock_ctx):
         """update_cache=False should not update cache on rule match."""
-        mock_ctx.dal.get_category_from_cache.return_value = None
+        mock_ctx.dal.get_category_cache_map.return_value = {}
 
         mock_account = MagicMock()
         mock_account.id = 10
         mock_account.full_name = "Expenses:Food:Groceries"
-        mock_ctx.accounts.lookup_by_name.return_value = mock_account
+        mock_ctx.accounts.find_by_name.return_value = mock_account
 
         service = CategorizeService(mock_ctx, rules_path=rules_file)
         result = service.lookup_category_for_payee("WHOLE FOODS", update_cache=False)
 
         assert result is not None
         # Should NOT update cache
+        service.flush_cache_hits()
         mock_ctx.dal.set_category_cache.assert_not_called()
-        mock_ctx.dal.increment_cache_hit.assert_not_called()
+        mock_ctx.dal.increment_cache_hits.assert_not_called()
 
     def test_cache_hit_with_update_cache_false(self, rules_file, mock_ctx):
         """Cache hit with update_cache=False should not increment hit count."""
-        mock_cache = MagicMock()
-        mock_cache.account_id = 10
-        mock_ctx.dal.get_category_from_cache.return_value = mock_cache
+        mock_ctx.dal.get_category_cache_map.return_value = {"WHOLE FOODS": 10}
 
         mock_account = MagicMock()
         mock_account.full_name = "Expenses:Food:Groceries"
-        mock_ctx.accounts.lookup_by_id.return_value = mock_account
+        mock_ctx.accounts.find_by_id.return_value = mock_account
 
         service = CategorizeService(mock_ctx, rules_path=rules_file)
         result = service.lookup_category_for_payee("WHOLE FOODS", update_cache=False)
 
         assert result is not None
         # Should NOT increment hit count
-        mock_ctx.dal.increment_cache_hit.assert_not_called()
+        service.flush_cache_hits()
+        mock_ctx.dal.increment_cache_hits.assert_not_called()
+
+    def test_bulk_lookup_uses_fixed_queries(self, rules_file, mock_ctx):
+        """Bulk lookup resolves cache and rule tiers with one call each."""
+        mock_ctx.dal.get_cached_category_accounts.return_value = {
+            "TRADER JOES": MagicMock(id=10, full_name="Expenses:Food:Groceries"),
+        }
+        mock_ctx.accounts.lookup_by_names.return_value = {
+            "Expenses:Food:Groceries": MagicMock(id=10, full_name="Expenses:Food:Groceries"),
+        }
+
+        service = CategorizeService(mock_ctx, rules_path=rules_file)
+        results = service.lookup_categories_for_payees(
+            ["TRADER JOES", "WHOLE FOODS", "TRADER JOES", "UNKNOWN", "WHOLE FOODS", ""]
+        )
+
+        assert results == {
+            "TRADER JOES": ("Expenses:Food:Groceries", 'cache'),
+            "WHOLE FOODS": ("Expenses:Food:Groceries", 'rule'),
+        }
+        mock_ctx.dal.get_cached_category_accounts.assert_called_once()
+        service.flush_cache_hits()
+        mock_ctx.dal.increment_cache_hits.assert_called_once_with({"TRADER JOES": 2})
+        mock_ctx.dal.set_category_cache_bulk.assert_called_once_with(
+            [{'payee_norm': "WHOLE FOODS", 'account_id': 10, 'hit_count': 2}]
+        )
+        mock_ctx.dal.get_category_cache_map.assert_not_called()
+
+    def test_bulk_lookup_update_cache_false(self, rules_file, mock_ctx):
+        """Bulk lookup with update_cache=False leaves the cache untouched."""
+        mock_ctx.dal.get_cached_category_accounts.return_value = {}
+        mock_ctx.accounts.lookup_by_names.return_value = {}
+
+        service = CategorizeService(mock_ctx, rules_path=rules_file)
+        results = service.lookup_categories_for_payees(["WHOLE FOODS"], update_cache=False)
+
+        # Rule matched but the account doesn't exist in the book
+        assert results == {}
+        service.flush_cache_hits()
+        mock_ctx.dal.increment_cache_hits.assert_not_called()
+        mock_ctx.dal.set_category_cache_bulk.assert_not_called()
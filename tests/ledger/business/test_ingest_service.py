@@ -1,58 +1,64 @@
 # test_ingest_service.py
 """Tests for Ingest Service."""
+
+import hashlib
 import pytest
 import tempfile
 import os
-from unittest.mock import MagicMock
+import threading
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import select
 
-from ledger.business.ingest_service import IngestService, IngestResult, IngestReport
+from ledger.business.account_service import AccountNotFound
+from ledger.business.book_context import BookContext, clear_book_cache
+from ledger.business.book_service import BookService
+from ledger.business.ingest_service import (
+    READ_WORKERS_MAX,
+    IngestService,
+    IngestResult,
+    IngestReport,
+)
+from ledger.business.management_service import ManagementService
+from ledger.db.models import CategoryCache, ImportFile
 
 
 class TestIngestServiceFileHash:
     """Tests for file hash computation."""
 
-    def test_compute_file_hash_same_content(self):
+    def test_read_qif_same_content_same_hash(self, tmp_path):
         """Same content should produce same hash."""
-        content = "test content for hashing"
+        content = "!Type:Bank\nD01/02/2024\nT-5.00\nPMarket\n^\n"
+        path1, path2 = tmp_path / 'one.qif', tmp_path / 'two.qif'
+        path1.write_text(content)
+        path2.write_text(content)
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f1:
-            f1.write(content)
-            f1.flush()
-            path1 = f1.name
+        hash1, _ = IngestService._read_qif(str(path1))
+        hash2, _ = IngestService._read_qif(str(path2))
+        assert hash1 == hash2
+        assert len(hash1) == 64  # SHA-256 hex length
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f2:
-            f2.write(content)
-            f2.flush()
-            path2 = f2.name
+    def test_read_qif_different_content_different_hash(self, tmp_path):
+        """Different content should produce different hash."""
+        path1, path2 = tmp_path / 'one.qif', tmp_path / 'two.qif'
+        path1.write_text("!Type:Bank\nD01/02/2024\nT-5.00\nPMarket\n^\n")
+        path2.write_text("!Type:Bank\nD01/02/2024\nT-6.00\nPMarket\n^\n")
 
-        try:
-            hash1 = IngestService._compute_file_hash(path1)
-            hash2 = IngestService._compute_file_hash(path2)
-            assert hash1 == hash2
-            assert len(hash1) == 64  # SHA-256 hex length
-        finally:
-            os.unlink(path1)
-            os.unlink(path2)
+        hash1, _ = IngestService._read_qif(str(path1))
+        hash2, _ = IngestService._read_qif(str(path2))
+        assert hash1 != hash2
 
-    def test_compute_file_hash_different_content(self):
-        """Different content should produce different hash."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f1:
-            f1.write("content one")
-            f1.flush()
-            path1 = f1.name
+    def test_read_qif_hashes_the_bytes_it_parses(self, tmp_path):
+        """_read_qif opens the file once and its hash is the SHA-256 of the file."""
+        path = tmp_path / 'statement.qif'
+        path.write_bytes(b"!Type:Bank\r\nD01/02/2024\r\nT-5.00\r\nPMarket\r\n^\r\n")
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f2:
-            f2.write("content two")
-            f2.flush()
-            path2 = f2.name
+        with patch('builtins.open', wraps=open) as opened:
+            file_hash, qif = IngestService._read_qif(str(path))
 
-        try:
-            hash1 = IngestService._compute_file_hash(path1)
-            hash2 = IngestService._compute_file_hash(path2)
-            assert hash1 != hash2
-        finally:
-            os.unlink(path1)
-            os.unlink(path2)
+        opened.assert_called_once()
+        assert file_hash == hashlib.sha256(path.read_bytes()).hexdigest()
+        assert [t['P'] for t in qif.transactions] == ['Market']
 
 
 class TestIngestReport:
@@ -114,7 +120,8 @@ LExpenses:Uncategorized
             qif_path = f.name
 
         try:
-            file_hash = IngestService._compute_file_hash(qif_path)
+            with open(qif_path, 'rb') as f:
+                file_hash = hashlib.sha256(f.read()).hexdigest()
 
             # Mock existing import with same hash
             mock_existing = MagicMock()
@@ -182,6 +189,10 @@ LExpenses:Uncategorized
                 raise Exception(f"Account not found: {name}")
 
             mock_ctx.accounts.lookup_by_name.side_effect = mock_lookup_by_name
+            mock_ctx.accounts.accounts_by_full_name.return_value = {
+                'Test:Account': MagicMock(id=1, full_name='Test:Account'),
+                'Expenses:Uncategorized': MagicMock(id=2, full_name='Expenses:Uncategorized'),
+            }
 
             service = IngestService(mock_ctx)
             report = service.ingest_qif(file_path=qif_path)
@@ -194,13 +205,20 @@ LExpenses:Uncategorized
         finally:
             os.unlink(qif_path)
 
+    def test_categorize_service_shared_across_files(self, mock_ctx):
+        """Every file ingested through one IngestService reuses its CategorizeService."""
+        service = IngestService(mock_ctx)
+
+        assert service.categorize is service.categorize
+        mock_ctx.before_commit.assert_called_once_with(service.categorize.flush_cache_hits)
+
 
 class TestIngestServiceErrors:
     """Tests for error handling."""
 
     def test_account_not_found(self, mock_ctx):
         """Should raise error if account not found."""
-        mock_ctx.accounts.lookup_by_name.side_effect = Exception("Account not found")
+        mock_ctx.accounts.lookup_by_name.side_effect = AccountNotFound("Nonexistent:Account")
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.qif', delete=False) as f:
             f.write("!Account\nNNonexistent:Account\n^\n")
@@ -229,3 +247,100 @@ class TestIngestServiceErrors:
                 service.ingest_qif(qif_path)
         finally:
             os.unlink(qif_path)
+
+    def test_ingest_qifs_yields_errors_in_order(self, mock_ctx, tmp_path):
+        """A rejected file is yielded as its error and the remaining files still ingest."""
+        mock_ctx.accounts.lookup_by_name.return_value = MagicMock(id=1, full_name='Test:Account')
+        existing = MagicMock(id=5, file_hash='different_hash_value')
+        mock_ctx.dal.get_import_file_by_scope.return_value = existing
+        paths = []
+        for name, content in [
+            ('first.qif', "!Account\nNTest:Account\n^\n"),
+            ('no-account.qif', "!Type:Bank\nD01/15/2024\nPTest\nT-100\n^\n"),
+            ('last.qif', "!Account\nNTest:Account\nTBank\n^\n"),
+        ]:
+            path = tmp_path / name
+            path.write_text(content)
+            paths.append(str(path))
+
+        service = IngestService(mock_ctx)
+        results = list(service.ingest_qifs(paths, max_workers=2))
+
+        assert [path for path, _ in results] == paths
+        first, error, last = (outcome for _, outcome in results)
+        assert first.result == IngestResult.HASH_MISMATCH
+        assert isinstance(error, ValueError)
+        assert last.result == IngestResult.HASH_MISMATCH
+
+    def test_ingest_qifs_reads_on_one_bounded_pool(self, mock_ctx, tmp_path):
+        """Reads run on a single pool that never exceeds READ_WORKERS_MAX threads."""
+        mock_ctx.accounts.lookup_by_name.return_value = MagicMock(id=1, full_name='Test:Account')
+        mock_ctx.dal.get_import_file_by_scope.return_value = MagicMock(id=5, file_hash='x')
+        paths = []
+        for i in range(READ_WORKERS_MAX * 3):
+            path = tmp_path / f'{i}.qif'
+            path.write_text("!Account\nNTest:Account\n^\n")
+            paths.append(str(path))
+
+        threads = set()
+        read_qif = IngestService._read_qif
+
+        def recording_read(file_path):
+            threads.add(threading.current_thread().name)
+            return read_qif(file_path)
+
+        service = IngestService(mock_ctx)
+        with patch.object(IngestService, '_read_qif', side_effect=recording_read):
+            results = list(service.ingest_qifs(paths, max_workers=READ_WORKERS_MAX * 4))
+
+        assert len(results) == len(paths)
+        assert 0 < len(threads) <= READ_WORKERS_MAX
+        assert all(name.startswith('qif-read') for name in threads)
+
+
+class TestIngestServiceRollback:
+    """A file rolled back by ingest_qifs leaves no trace in the category cache."""
+
+    @pytest.fixture
+    def db_url(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'ingest.db'}"
+        with ManagementService().init_with_url(url) as mgmt:
+            mgmt.reset_database()
+        with BookService().init_with_url(url) as book_service:
+            book_service.create_new_book("ingest-book")
+        with BookContext("ingest-book", url) as ctx:
+            ctx.accounts.add_account(
+                None, None, "Checking", "Checking", "100", "ASSET", "", False, False
+            )
+            coffee = ctx.accounts.add_account(
+                None, None, "Coffee", "Coffee", "500", "EXPENSE", "", False, False
+            )
+            ctx.dal.set_category_cache("COFFEE SHOP", coffee.id)
+        yield url
+        clear_book_cache()
+
+    def test_rolled_back_file_does_not_count_cache_hits(self, db_url, tmp_path):
+        good = tmp_path / 'good.qif'
+        good.write_text(
+            "!Account\nNChecking\n^\n!Type:Bank\nD01/02/2024\nT-5.00\nPCOFFEE SHOP\n^\n"
+        )
+        bad = tmp_path / 'bad.qif'
+        bad.write_text(
+            "!Account\nNChecking\n^\n!Type:Bank\n"
+            "D01/03/2024\nT-5.00\nPCOFFEE SHOP\n^\n"
+            "D01/04/2024\nT-9.00\nPBOOKSTORE\nLNo Such Account\n^\n"
+        )
+
+        with BookContext("ingest-book", db_url) as ctx:
+            service = IngestService(ctx, matching_rules='', category_rules_path='')
+            results = dict(service.ingest_qifs([str(good), str(bad)], max_workers=1))
+        assert results[str(good)].result == IngestResult.IMPORTED
+        assert isinstance(results[str(bad)], ValueError)
+
+        with BookContext("ingest-book", db_url) as ctx:
+            assert ctx.dal.get_category_cache_map() == {
+                "COFFEE SHOP": ctx.accounts.lookup_by_name("Coffee").id
+            }
+            entry = ctx.dal.session.scalars(select(CategoryCache)).one()
+            assert entry.hit_count == 2
+            assert [f.filename for f in ctx.dal.session.scalars(select(ImportFile))] == ['good.qif']
@@ -5,6 +5,10 @@ import json
 import tempfile
 import os
 
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
 from ledger.db.models import Base
 from ledger.business.book_context import BookContext
 from ledger.business.book_service import BookService
@@ -90,3 +94,142 @@ def test_reset_database(db_url):
         book_service.create_new_book(test_book_name)
         management_service.reset_database()
         assert not book_service.get_book_by_name(test_book_name)
+
+
+# split as created before amounts moved to integer storage
+OLD_SPLIT_DDL = """
+CREATE TABLE split (
+    id INTEGER NOT NULL PRIMARY KEY,
+    transaction_id INTEGER NOT NULL REFERENCES transactions (id),
+    account_id INTEGER NOT NULL REFERENCES account (id),
+    amount DECIMAL(20, 4),
+    memo TEXT,
+    reconcile_date DATETIME,
+    reconcile_state VARCHAR(1) DEFAULT 'n' NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+)
+"""
+
+
+def _engine_with_split(*statements):
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        conn.execute(text("DROP TABLE split"))
+        for statement in statements:
+            conn.execute(text(statement))
+    return engine
+
+
+def _split_columns(session):
+    return {c['name']: c for c in inspect(session.connection()).get_columns('split')}
+
+
+def test_migrate_split_amount_to_e4():
+    engine = _engine_with_split(
+        OLD_SPLIT_DDL,
+        "INSERT INTO split (id, transaction_id, account_id, amount, memo)"
+        " VALUES (1, 1, 1, 123.45, 'a'), (2, 1, 2, -0.0001, 'b')",
+    )
+    session = sessionmaker(bind=engine)()
+    try:
+        service = ManagementService(session=session)
+        assert service.migrate_split_amount_to_e4() is True
+        session.commit()
+        # Already migrated: no-op
+        assert service.migrate_split_amount_to_e4() is False
+
+        columns = _split_columns(session)
+        assert 'amount' not in columns
+        assert columns['amount_e4']['nullable'] is False
+        rows = session.execute(text("SELECT id, amount_e4, memo FROM split ORDER BY id")).all()
+        assert [tuple(r) for r in rows] == [(1, 1234500, 'a'), (2, -1, 'b')]
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_migrate_split_amount_to_e4_finishes_partial_migration():
+    # An earlier version of the migration added a nullable amount_cents column
+    engine = _engine_with_split(
+        OLD_SPLIT_DDL.replace(
+            "amount DECIMAL(20, 4)", "amount DECIMAL(20, 4), amount_cents BIGINT"
+        ),
+        "INSERT INTO split (id, transaction_id, account_id, amount, amount_cents)"
+        " VALUES (1, 1, 1, 0.05, 500), (2, 1, 2, 1.5, NULL)",
+    )
+    session = sessionmaker(bind=engine)()
+    try:
+        service = ManagementService(session=session)
+        assert service.migrate_split_amount_to_e4() is True
+        session.commit()
+
+        columns = _split_columns(session)
+        assert {'amount', 'amount_cents'}.isdisjoint(columns)
+        assert columns['amount_e4']['nullable'] is False
+        rows = session.execute(text("SELECT id, amount_e4 FROM split ORDER BY id")).all()
+        assert [tuple(r) for r in rows] == [(1, 500), (2, 15000)]
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_migrate_split_amount_to_e4_rolls_back_as_a_whole():
+    engine = _engine_with_split(
+        OLD_SPLIT_DDL,
+        "INSERT INTO split (id, transaction_id, account_id, amount) VALUES (1, 1, 1, NULL)",
+    )
+    session = sessionmaker(bind=engine)()
+    try:
+        service = ManagementService(session=session)
+        with pytest.raises(IntegrityError):
+            service.migrate_split_amount_to_e4()
+        session.rollback()
+
+        assert set(_split_columns(session)) >= {'amount'}
+        assert 'split_new' not in inspect(session.connection()).get_table_names()
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_create_missing_indexes():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_account_book_fullname"))
+
+    session = sessionmaker(bind=engine)()
+    try:
+        service = ManagementService(session=session)
+        assert service.create_missing_indexes() == ['ux_account_book_fullname']
+        assert service.create_missing_indexes() == []
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_backfill_payee_norm():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO book (id, name) VALUES (1, 'b')"))
+        conn.execute(
+            text(
+                "INSERT INTO transactions (id, book_id, transaction_date, transaction_description, "
+                "payee_norm) VALUES (1, 1, '2024-01-01', 'Coffee  Shop 01/15', NULL), "
+                "(2, 1, '2024-01-02', 'Grocer', 'KEEP')"
+            )
+        )
+
+    session = sessionmaker(bind=engine)()
+    try:
+        service = ManagementService(session=session)
+        assert service.backfill_payee_norm() == 1
+        assert service.backfill_payee_norm() == 0
+        rows = session.execute(text("SELECT id, payee_norm FROM transactions ORDER BY id")).all()
+        assert rows == [(1, 'COFFEE SHOP'), (2, 'KEEP')]
+    finally:
+        session.close()
+        engine.dispose()
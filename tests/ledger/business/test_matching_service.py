@@ -1,9 +1,11 @@
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from unittest.mock import MagicMock, patch
 from ledger.business.matching_service import (
     MatchingService,
     MatchingRules,
+    _CandidateIndex,
+    date_span,
 )
 
 
@@ -318,3 +320,43 @@ def test_matching_rules_malformed_data(mock_account):
 
         with pytest.raises(KeyError):
             matching_rules.matching_patterns(test_account_1, test_account_2)
+
+
+def test_date_span():
+    txns = [MagicMock(transaction_date=date(2024, 1, d)) for d in (15, 3, 27, 9)]
+
+    assert date_span(txns) == (date(2024, 1, 3), date(2024, 1, 27))
+    assert date_span(iter(txns)) == (date(2024, 1, 3), date(2024, 1, 27))
+
+
+def test_date_span_empty():
+    assert date_span([]) == (None, None)
+
+
+def _txn(reference, *splits):
+    return MagicMock(
+        transfer_reference=reference,
+        splits=[MagicMock(account_id=a, amount=amt) for a, amt in splits],
+    )
+
+
+def test_candidate_index_possible_matches():
+    same_splits = _txn(None, (2, 50), (1, -50))
+    other_amount = _txn(None, (2, 75), (1, -75))
+    same_reference = _txn('REF1', (3, 10), (4, -10))
+    other_reference = _txn('REF2', (1, -50), (2, 50))
+    unsplit = _txn(None)
+    candidates = [same_reference, other_amount, same_splits, other_reference, unsplit]
+    index = _CandidateIndex(candidates)
+
+    # Without a reference: any candidate whose first split is one of the import's
+    assert index.possible_matches(_txn(None, (1, -50), (2, 50))) == [
+        same_splits,
+        other_reference,
+    ]
+    # With a reference: its reference, or candidates without one that match splits
+    assert index.possible_matches(_txn('REF1', (1, -50), (2, 50))) == [
+        same_reference,
+        same_splits,
+    ]
+    assert index.possible_matches(_txn(None)) == candidates
@@ -0,0 +1,144 @@
+"""Tests for SessionScope."""
+
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import insert, select, text
+
+from ledger.business.session_scope import SessionScope
+from ledger.db.models import Base, Book
+
+
+def _scope_with_mock_session():
+    scope = SessionScope(db_url="sqlite:///unused.db")
+    session = MagicMock()
+    scope.session_factory = MagicMock(return_value=session)
+    return scope, session
+
+
+def test_commits_and_closes_on_success():
+    scope, session = _scope_with_mock_session()
+
+    entered_session, dal = scope.enter()
+    scope.exit(None)
+
+    assert entered_session is session
+    session.begin.assert_called_once()
+    assert dal.session is session
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+    session.close.assert_called_once()
+    assert scope.session is None and scope.dal is None
+
+
+def test_rolls_back_on_error():
+    scope, session = _scope_with_mock_session()
+
+    scope.enter()
+    scope.exit(ValueError)
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+    session.close.assert_called_once()
+
+
+def test_skips_commit_without_open_transaction():
+    scope, session = _scope_with_mock_session()
+    session.in_transaction.return_value = False
+
+    scope.enter()
+    scope.exit(None)
+
+    session.commit.assert_not_called()
+    session.close.assert_called_once()
+
+
+def test_read_only_transaction_is_released_without_commit(tmp_path):
+    scope = SessionScope(db_url=f"sqlite:///{tmp_path / 'scope.db'}")
+    session, _ = scope.enter()
+    Base.metadata.create_all(session.connection())
+    session.commit()
+    session.add(Book(name='read-book'))
+    session.commit()
+    session.begin()
+    (book,) = session.scalars(select(Book)).all()
+
+    with patch.object(session, 'commit') as commit, patch.object(session, 'rollback') as rollback:
+        scope.exit(None)
+    commit.assert_not_called()
+    rollback.assert_not_called()
+    # Closing without a rollback leaves loaded objects readable after exit
+    assert book.name == 'read-book'
+
+
+def test_write_flag_is_scoped_to_one_transaction(tmp_path):
+    scope = SessionScope(db_url=f"sqlite:///{tmp_path / 'scope.db'}")
+    session, _ = scope.enter()
+    connection = session.connection()
+    connection.execute(text("CREATE TABLE t (x INTEGER)"))
+    session_info = session.info
+    session.commit()
+    session.begin()
+    session.connection().execute(text("SELECT 1"))
+
+    with patch.object(session, 'commit') as commit:
+        scope.exit(None)
+    commit.assert_not_called()
+
+    # The pooled connection no longer points at the finished session
+    with scope.engine.begin() as conn:
+        assert 'session_info' not in conn.info
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    assert 'has_writes' not in session_info
+
+
+def test_core_write_is_committed(tmp_path):
+    url = f"sqlite:///{tmp_path / 'scope.db'}"
+    scope = SessionScope(db_url=url)
+    session, _ = scope.enter()
+    Base.metadata.create_all(session.connection())
+    session.commit()
+    session.begin()
+    session.execute(insert(Book), [{'name': 'core-book'}])
+    scope.exit(None)
+
+    session, _ = scope.enter()
+    try:
+        assert session.scalars(select(Book.name)).all() == ['core-book']
+    finally:
+        scope.exit(None)
+
+
+def test_raw_connection_write_is_committed(tmp_path):
+    scope = SessionScope(db_url=f"sqlite:///{tmp_path / 'scope.db'}")
+    session, _ = scope.enter()
+    session.connection().execute(text("CREATE TABLE t (x INTEGER)"))
+    session.connection().execute(text("INSERT INTO t VALUES (1)"))
+    scope.exit(None)
+
+    session, _ = scope.enter()
+    try:
+        assert session.connection().execute(text("SELECT count(*) FROM t")).scalar() == 1
+    finally:
+        scope.exit(None)
+
+
+def test_external_session_is_left_alone():
+    session = MagicMock()
+    scope = SessionScope(session=session)
+
+    assert scope.enter()[0] is session
+    scope.exit(None)
+
+    session.commit.assert_not_called()
+    session.close.assert_not_called()
+    assert scope.session is session
+
+
+def test_session_factory_keeps_objects_loaded_across_commits(tmp_path):
+    scope = SessionScope(db_url=f"sqlite:///{tmp_path / 'scope.db'}")
+    session, _ = scope.enter()
+    try:
+        assert session.expire_on_commit is False
+        assert session.autoflush is False
+    finally:
+        scope.exit(None)
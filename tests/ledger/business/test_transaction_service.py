@@ -79,6 +79,16 @@ def test_get_all_transactions(transaction_service, mock_dal):
     mock_dal.list_transactions_for_book.assert_called_once_with(book_id=1)
 
 
+def test_iter_all_transactions(transaction_service, mock_dal):
+    """Test streaming transactions for the book without materializing a list."""
+    mock_dal.list_transactions_for_book.return_value = iter([MagicMock(id=1), MagicMock(id=2)])
+
+    result = transaction_service.iter_all()
+
+    assert [t.id for t in result] == [1, 2]
+    mock_dal.list_transactions_for_book.assert_called_once_with(book_id=1)
+
+
 def test_mark_matched(transaction_service, mock_dal):
     """Test marking a transaction as matched."""
     mock_txn = MagicMock()
@@ -104,6 +114,18 @@ def test_query_unmatched(transaction_service, mock_dal):
     )
 
 
+def test_rows_in_range(transaction_service, mock_dal):
+    """Test fetching column-only rows in a date range."""
+    from datetime import date
+
+    mock_dal.get_transactions_rows_in_range.return_value = []
+    start = date(2024, 1, 1)
+    end = date(2024, 1, 31)
+
+    assert transaction_service.rows_in_range(start, end) == []
+    mock_dal.get_transactions_rows_in_range.assert_called_once_with(1, start, end)
+
+
 def test_insert_transaction(transaction_service, mock_dal):
     """Test inserting a transaction object."""
     mock_txn = MagicMock()
@@ -113,3 +135,12 @@ def test_insert_transaction(transaction_service, mock_dal):
 
     assert result == mock_txn
     mock_dal.insert_transaction.assert_called_once_with(mock_txn)
+
+
+def test_mark_matched_bulk(transaction_service, mock_dal):
+    """Test marking many transactions as matched in one DAL call."""
+    txns = [MagicMock(), MagicMock()]
+
+    transaction_service.mark_matched_bulk(txns)
+
+    mock_dal.update_transactions_match_status.assert_called_once_with(txns)
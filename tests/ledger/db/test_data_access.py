@@ -1,11 +1,13 @@
 from datetime import date, datetime
+from decimal import Decimal
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from sqlalchemy import create_engine
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
 from ledger.db.data_access import DAL
-from ledger.db.models import Base, Account, Transaction
+from ledger.db.models import Base, Account, Transaction, Split
 
 
 @pytest.fixture
@@ -59,14 +61,15 @@ def test_create_account(dal, mock_session):
 
 
 def test_get_account(dal, mock_session):
-    mock_session.query().filter_by().one_or_none.return_value = Account(id="1", name="Test Account")
+    mock_session.get.return_value = Account(id="1", name="Test Account")
 
     account = dal.get_account("1")
     assert account.name == "Test Account"
+    mock_session.get.assert_called_once_with(Account, "1")
 
 
 def test_list_accounts_for_book(dal, mock_session):
-    mock_session.query().filter_by().all.return_value = [Account(id="1", name="Test Account")]
+    mock_session.scalars().all.return_value = [Account(id="1", name="Test Account")]
 
     accounts = dal.list_accounts_for_book("1")
     assert len(accounts) == 1
@@ -95,11 +98,11 @@ def test_get_transaction(dal, mock_session):
 
 
 def test_list_transactions_for_book(dal, mock_session):
-    mock_session.query().options().filter_by().all.return_value = [
-        Transaction(id="1", transaction_description="Test Transaction")
-    ]
+    mock_session.scalars.return_value = iter(
+        [Transaction(id="1", transaction_description="Test Transaction")]
+    )
 
-    transactions = dal.list_transactions_for_book("1")
+    transactions = list(dal.list_transactions_for_book("1"))
     assert len(transactions) == 1
     assert transactions[0].transaction_description == "Test Transaction"
 
@@ -189,3 +192,267 @@ def test_query_for_unmatched_transactions_in_range(mem_dal):
     assert len(transactions_with_recon) == 2
     assert transactions_with_recon[0].transaction_description == "Transaction 2"
     assert transactions_with_recon[1].transaction_description == "Transaction 3"
+
+
+def test_get_account_by_fullname_for_book_binds_params(mem_dal):
+    book = mem_dal.create_book("Lookup Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="101", name="Cash", full_name="Assets:Cash"
+    )
+    bank = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="102", name="Bank", full_name="Assets:Bank"
+    )
+
+    # Repeated calls reuse the cached statement but must bind fresh values
+    assert mem_dal.get_account_by_fullname_for_book(book.id, "Assets:Cash").id == cash.id
+    assert mem_dal.get_account_by_fullname_for_book(book.id, "Assets:Bank").id == bank.id
+    assert mem_dal.get_account_by_fullname_for_book(book.id, "Assets:None") is None
+    assert mem_dal.get_account_by_name_for_book(book.id, "102", "Bank").id == bank.id
+
+
+def test_split_amount_round_trip(mem_dal):
+    book = mem_dal.create_book("Amount Book")
+    account = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="201", name="Cash", full_name="Assets:Cash"
+    )
+    txn = mem_dal.create_transaction(
+        book_id=book.id, transaction_date=d("2023-11-01"), transaction_description="Amount"
+    )
+
+    split = mem_dal.create_split(transaction_id=txn.id, account_id=account.id, amount="-12.3456")
+
+    assert split.amount_e4 == -123456
+    assert split.amount == Decimal("-12.3456")
+
+
+def test_insert_transactions_bulk(mem_dal):
+    book = mem_dal.create_book("Bulk Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="301", name="Cash", full_name="Assets:Cash"
+    )
+    food = mem_dal.create_account(
+        book_id=book.id, acct_type="EXPENSE", code="302", name="Food", full_name="Expenses:Food"
+    )
+
+    txns = []
+    for day, amount in [("2023-12-01", "10.00"), ("2023-12-02", "25.50")]:
+        txn = Transaction(
+            book_id=book.id, transaction_date=d(day), transaction_description=f"Bulk {day}"
+        )
+        txn.splits = [
+            Split(account_id=food.id, amount=Decimal(amount)),
+            Split(account_id=cash.id, amount=-Decimal(amount)),
+        ]
+        txns.append(txn)
+
+    mem_dal.insert_transactions(txns)
+
+    stored = sorted(mem_dal.list_transactions_for_book(book.id), key=lambda t: t.transaction_date)
+    assert [t.transaction_description for t in stored] == ["Bulk 2023-12-01", "Bulk 2023-12-02"]
+    assert all(t.match_status == 'n' for t in stored)
+    assert sorted(s.amount for s in stored[1].splits) == [Decimal("-25.50"), Decimal("25.50")]
+    assert {s.account.full_name for s in stored[0].splits} == {"Assets:Cash", "Expenses:Food"}
+
+
+def test_list_queries_raise_on_unloaded_relationships(mem_dal):
+    book = mem_dal.create_book("Raiseload Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="401", name="Cash", full_name="Assets:Cash"
+    )
+    txn = Transaction(
+        book_id=book.id, transaction_date=d("2024-01-01"), transaction_description="R"
+    )
+    txn.splits = [Split(account_id=cash.id, amount=Decimal("1.00"))]
+    book_id = book.id
+    mem_dal.insert_transactions([txn])
+    mem_dal.session.expunge_all()
+
+    (stored,) = mem_dal.list_transactions_for_book(book_id)
+    assert stored.splits[0].account.full_name == "Assets:Cash"
+    with pytest.raises(InvalidRequestError):
+        stored.import_file
+
+    (account,) = mem_dal.list_accounts_for_book(book_id, raise_on_lazy=True)
+    with pytest.raises(InvalidRequestError):
+        account.parent_account
+
+    mem_dal.session.expunge_all()
+    (account,) = mem_dal.list_accounts_for_book(book_id)
+    assert account.parent_account is None
+
+    mem_dal.session.expunge_all()
+    (account,) = mem_dal.list_accounts_for_book(book_id, with_splits=True)
+    assert [s.amount for s in account.splits] == [Decimal("1.00")]
+
+
+def test_get_transactions_rows_in_range(mem_dal):
+    book = mem_dal.create_book("Rows Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="501", name="Cash", full_name="Assets:Cash"
+    )
+    for day, amount in [("2024-02-01", "5.25"), ("2024-02-15", "7.00"), ("2024-03-01", "1.00")]:
+        txn = mem_dal.create_transaction(
+            book_id=book.id, transaction_date=d(day), transaction_description=f"Row {day}"
+        )
+        mem_dal.create_split(transaction_id=txn.id, account_id=cash.id, amount=amount)
+
+    rows = mem_dal.get_transactions_rows_in_range(book.id, date(2024, 2, 1), date(2024, 2, 29))
+
+    assert [r["transaction_description"] for r in rows] == ["Row 2024-02-01", "Row 2024-02-15"]
+    assert [r["amount"] for r in rows] == [Decimal("5.25"), Decimal("7.00")]
+    assert {r["account_id"] for r in rows} == {cash.id}
+
+
+def test_get_accounts_by_name_pairs_for_book(mem_dal):
+    book = mem_dal.create_book("Pairs Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="601", name="Cash", full_name="Assets:Cash"
+    )
+    bank = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="602", name="Bank", full_name="Assets:Bank"
+    )
+
+    found = mem_dal.get_accounts_by_name_pairs_for_book(
+        book.id, {("601", "Cash"), ("602", "Bank"), ("602", "Cash")}
+    )
+
+    assert {k: v.id for k, v in found.items()} == {
+        ("601", "Cash"): cash.id,
+        ("602", "Bank"): bank.id,
+    }
+    assert mem_dal.get_accounts_by_name_pairs_for_book(book.id, set()) == {}
+
+
+def test_get_account_uses_identity_map(mem_dal):
+    book = mem_dal.create_book("Identity Book")
+    cash = mem_dal.create_account(
+        book_id=book.id, acct_type="ASSET", code="701", name="Cash", full_name="Assets:Cash"
+    )
+    cash_id = cash.id
+    mem_dal.list_accounts_for_book(book.id)
+
+    with patch.object(mem_dal.session, 'execute', wraps=mem_dal.session.execute) as spy:
+        assert mem_dal.get_account(cash_id) is cash
+    spy.assert_not_called()
+
+
+def test_category_cache_bulk_methods(mem_dal):
+    book = mem_dal.create_book("Cache Bulk Book")
+    groceries = mem_dal.create_account(
+        book_id=book.id,
+        acct_type="EXPENSE",
+        code="801",
+        name="Groceries",
+        full_name="Expenses:Groceries",
+    )
+    dining = mem_dal.create_account(
+        book_id=book.id,
+        acct_type="EXPENSE",
+        code="802",
+        name="Dining",
+        full_name="Expenses:Dining",
+    )
+    mem_dal.set_category_cache("BULK MARKET", groceries.id)
+
+    mem_dal.set_category_cache_bulk(
+        [
+            {'payee_norm': "BULK MARKET", 'account_id': dining.id, 'hit_count': 2},
+            {'payee_norm': "BULK CAFE", 'account_id': dining.id, 'hit_count': 3},
+        ]
+    )
+    mem_dal.increment_cache_hits({"BULK CAFE": 4, "BULK MISSING": 1})
+
+    entries = mem_dal.get_categories_from_cache_bulk(["BULK MARKET", "BULK CAFE", "BULK MISSING"])
+    assert set(entries) == {"BULK MARKET", "BULK CAFE"}
+    assert entries["BULK MARKET"].account_id == dining.id
+    assert entries["BULK MARKET"].hit_count == 3
+    assert entries["BULK CAFE"].hit_count == 7
+
+
+def test_get_category_from_cache_uses_identity_map(mem_dal):
+    book = mem_dal.create_book("Cache Identity Book")
+    groceries = mem_dal.create_account(
+        book_id=book.id,
+        acct_type="EXPENSE",
+        code="901",
+        name="Groceries",
+        full_name="Expenses:Groceries",
+    )
+    entry = mem_dal.set_category_cache("IDENTITY MARKET", groceries.id)
+    mem_dal.get_categories_from_cache_bulk(["IDENTITY MARKET"])
+
+    with patch.object(mem_dal.session, 'execute', wraps=mem_dal.session.execute) as spy:
+        assert mem_dal.get_category_from_cache("IDENTITY MARKET") is entry
+    spy.assert_not_called()
+    assert mem_dal.get_category_from_cache("NO SUCH PAYEE") is None
+    assert mem_dal.get_category_cache_map()["IDENTITY MARKET"] == groceries.id
+
+
+def test_get_cached_category_accounts_joins_accounts_in_book(mem_dal):
+    book = mem_dal.create_book("Cache Join Book")
+    other = mem_dal.create_book("Cache Join Other Book")
+    groceries = mem_dal.create_account(
+        book_id=book.id,
+        acct_type="EXPENSE",
+        code="911",
+        name="Groceries",
+        full_name="Expenses:Groceries",
+    )
+    elsewhere = mem_dal.create_account(
+        book_id=other.id,
+        acct_type="EXPENSE",
+        code="912",
+        name="Dining",
+        full_name="Expenses:Dining",
+    )
+    mem_dal.set_category_cache("JOIN MARKET", groceries.id)
+    mem_dal.set_category_cache("JOIN CAFE", elsewhere.id)
+
+    found = mem_dal.get_cached_category_accounts(
+        book.id, ["JOIN MARKET", "JOIN CAFE", "JOIN NOWHERE"]
+    )
+
+    assert found == {"JOIN MARKET": groceries}
+
+
+def test_update_transactions_match_status(mem_dal):
+    book = mem_dal.create_book("Match Status Book")
+    txns = [
+        mem_dal.create_transaction(
+            book_id=book.id, transaction_date=d("2024-04-01"), transaction_description=f"Txn {i}"
+        )
+        for i in range(3)
+    ]
+    ids = [t.id for t in txns]
+
+    mem_dal.update_transactions_match_status([txns[0], txns[2], txns[0]])
+
+    assert [t.match_status for t in txns[::2]] == ['m', 'm']
+    mem_dal.session.expire_all()
+    statuses = {t.id: t.match_status for t in map(mem_dal.get_transaction, ids)}
+    assert statuses[ids[0]] == statuses[ids[2]] == 'm'
+    assert statuses[ids[1]] != 'm'
+
+
+def test_deferred_commits_commit_once(dal, mock_session):
+    with dal.deferred_commits():
+        dal.create_book("First")
+        with dal.deferred_commits():
+            dal.create_book("Second")
+        mock_session.commit.assert_not_called()
+
+    assert mock_session.flush.call_count == 2
+    mock_session.commit.assert_called_once()
+    dal.create_book("After")
+    assert mock_session.commit.call_count == 2
+
+
+def test_deferred_commits_roll_back_on_error(dal, mock_session):
+    with pytest.raises(ValueError):
+        with dal.deferred_commits():
+            dal.create_book("Partial")
+            raise ValueError("boom")
+
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_called_once()
+    assert dal._defer_depth == 0
@@ -0,0 +1,63 @@
+"""Tests for engine construction."""
+
+from unittest.mock import patch
+
+from ledger.db.engine import create_db_engine, dispose_engines, get_engine
+
+
+def test_sqlite_engine_uses_insertmanyvalues():
+    engine = create_db_engine('sqlite:///:memory:')
+    try:
+        assert engine.dialect.use_insertmanyvalues
+        assert engine.dialect.insertmanyvalues_page_size == 1000
+        assert engine._compiled_cache.capacity == 1200
+    finally:
+        engine.dispose()
+
+
+def test_psycopg2_engine_enables_values_plus_batch():
+    with (
+        patch('ledger.db.engine.event'),
+        patch('ledger.db.engine.create_engine') as mock_create_engine,
+    ):
+        create_db_engine('postgresql+psycopg2://user:pw@localhost/ledger')
+
+    kwargs = mock_create_engine.call_args.kwargs
+    assert kwargs['executemany_mode'] == 'values_plus_batch'
+    assert kwargs['executemany_batch_page_size'] == 500
+    assert kwargs['insertmanyvalues_page_size'] == 1000
+    assert kwargs['pool_size'] == 10
+    assert kwargs['max_overflow'] == 20
+    assert kwargs['pool_recycle'] == 3600
+
+
+def test_non_psycopg2_engine_skips_psycopg2_options():
+    with (
+        patch('ledger.db.engine.event'),
+        patch('ledger.db.engine.create_engine') as mock_create_engine,
+    ):
+        create_db_engine('sqlite:///db/test.db')
+
+    assert 'executemany_mode' not in mock_create_engine.call_args.kwargs
+
+
+def test_file_sqlite_engine_uses_sized_queue_pool(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pooled.db'}")
+    try:
+        assert engine.pool.size() == 10
+        assert engine.pool._recycle == 3600
+    finally:
+        engine.dispose()
+
+
+def test_get_engine_reuses_engine_per_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cached.db'}"
+    try:
+        assert get_engine(url) is get_engine(url)
+        assert get_engine(f"sqlite:///{tmp_path / 'other.db'}") is not get_engine(url)
+    finally:
+        dispose_engines()
+
+
+def test_get_engine_never_shares_in_memory_databases():
+    assert get_engine('sqlite:///:memory:') is not get_engine('sqlite:///:memory:')
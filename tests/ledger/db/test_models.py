@@ -0,0 +1,95 @@
+"""Tests for model helpers."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ledger.db.engine import create_db_engine
+from ledger.db.models import (
+    Base,
+    Account,
+    Book,
+    Split,
+    Transaction,
+    CorrespondingSplitNotFoundError,
+    InvalidTransactionSplitError,
+)
+
+
+def _txn_with_splits(*accounts):
+    txn = Transaction(id=1)
+    for account in accounts:
+        split = Split(account_id=account.id, amount=Decimal('1.00'))
+        split._account_cache = account
+        txn.splits.append(split)
+    return txn
+
+
+def test_corresponding_account_returns_other_side():
+    checking = Account(id=1, full_name='Assets:Checking')
+    groceries = Account(id=2, full_name='Expenses:Groceries')
+    txn = _txn_with_splits(checking, groceries)
+
+    assert txn.corresponding_account(checking) is groceries
+    assert txn.corresponding_account(groceries) is checking
+
+
+def test_corresponding_account_same_account_on_both_sides():
+    checking = Account(id=1, full_name='Assets:Checking')
+    txn = _txn_with_splits(checking, checking)
+
+    with pytest.raises(CorrespondingSplitNotFoundError):
+        txn.corresponding_account(checking)
+
+
+def test_corresponding_account_requires_two_splits():
+    checking = Account(id=1, full_name='Assets:Checking')
+    txn = _txn_with_splits(checking)
+
+    with pytest.raises(InvalidTransactionSplitError):
+        txn.corresponding_account(checking)
+
+
+@pytest.mark.parametrize(
+    'model, rel', [(Account, 'splits'), (Book, 'accounts'), (Book, 'transactions')]
+)
+def test_parent_relationships_do_not_cascade_deletes(model, rel):
+    prop = inspect(model).relationships[rel]
+
+    assert not prop.cascade.delete
+    assert not prop.cascade.delete_orphan
+    assert prop.passive_deletes
+
+
+@pytest.mark.parametrize('model', [Book, Account])
+def test_delete_with_children_is_refused_by_foreign_keys(model):
+    engine = create_db_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            book = Book(name='Test Book')
+            cash = Account(book=book, code='100', name='Cash', full_name='Cash', acct_type='ASSET')
+            food = Account(
+                book=book, code='500', name='Food', full_name='Food', acct_type='EXPENSE'
+            )
+            txn = Transaction(
+                book=book, transaction_date=date(2024, 1, 1), transaction_description='Market'
+            )
+            txn.splits = [
+                Split(account=cash, amount=Decimal('-5.00')),
+                Split(account=food, amount=Decimal('5.00')),
+            ]
+            session.add(txn)
+            session.commit()
+
+        # Fresh session: the children are not loaded, so only the database can refuse
+        with Session(engine) as session:
+            session.delete(session.query(model).order_by(model.id).first())
+            with pytest.raises(IntegrityError, match='FOREIGN KEY'):
+                session.flush()
+    finally:
+        engine.dispose()
@@ -50,3 +50,10 @@ class TestNormalizePayee:
         # Should strip card number and PPD ID
         assert "XXXX1234" not in result
         assert "PPD ID" not in result
+
+    def test_repeated_description_is_memoized(self):
+        """A repeated description is normalized once."""
+        normalize_payee.cache_clear()
+        assert normalize_payee("STARBUCKS STORE 12345678") == "STARBUCKS STORE"
+        assert normalize_payee("STARBUCKS STORE 12345678") == "STARBUCKS STORE"
+        assert normalize_payee.cache_info().hits == 1
@@ -9,6 +9,9 @@ from ledger.util.pdf_parser import (
     StatementPdfParser,
     StatementParseError,
     get_patterns,
+    parse_slug,
+    slug_prefix,
+    SlugInfo,
     STATEMENT_PATTERNS,
 )
 from ledger.util.statement_uri import AccountUri
@@ -30,6 +33,20 @@ class TestGetPatterns:
         with pytest.raises(StatementParseError):
             get_patterns("unknown-account-type")
 
+    def test_slug_prefix(self):
+        assert slug_prefix("checking-chase-personal-1381") == "checking-chase-personal"
+        assert slug_prefix("creditcard-citi-business") == "creditcard-citi-business"
+        assert slug_prefix("cash") is None
+
+    def test_parse_slug(self):
+        assert parse_slug("checking-chase-personal-1381") == SlugInfo(
+            "checking", "chase", "personal", "1381"
+        )
+        assert parse_slug("creditcard-citi-business") == SlugInfo(
+            "creditcard", "citi", "business", None
+        )
+        assert parse_slug("checking-chase-personal-x1381") is None
+
 
 @pytest.fixture
 def mock_fitz_doc():
@@ -143,6 +160,11 @@ class TestStatementPdfParser:
                 StatementPdfParser().parse_statement(uri)
         assert "balance" in str(exc_info.value).lower()
 
+    @pytest.mark.parametrize('slug', ['checking-chase-personal', 'checking-chase-personal-x1381'])
+    def test_chase_checking_slug_without_account_number_raises(self, slug):
+        with pytest.raises(StatementParseError, match="Cannot extract account number"):
+            StatementPdfParser()._extract_chase_checking_balances("", slug, "stmt.pdf")
+
 
 class TestStatementPatterns:
     def test_all_patterns_have_required_keys(self):
@@ -0,0 +1,81 @@
+"""Tests for QIF parsing."""
+
+from collections.abc import Iterator
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from ledger.util.qif import Qif
+
+QIF_DATA = """!Account
+NAssets:Checking
+TBank
+^
+!Type:Bank
+D01/15/2024
+PWHOLE FOODS MARKET #123
+T-45.67
+LExpenses:Food:Groceries
+^
+D01/16/2024
+PPAYROLL DEPOSIT
+T1000.00
+^
+"""
+
+
+def test_init_from_qif_data_account_section():
+    qif = Qif().init_from_qif_data(QIF_DATA.splitlines())
+
+    assert qif.account() == 'Assets:Checking'
+    assert qif.account_info['T'] == 'Bank'
+    assert qif.transaction_type == 'Bank'
+
+
+def test_init_from_qif_data_transactions():
+    qif = Qif().init_from_qif_data(QIF_DATA.splitlines())
+
+    assert len(qif.transactions) == 2
+    first, second = qif.transactions
+    assert first['D'] == '01/15/2024'
+    assert first['T'] == '-45.67'
+    assert Qif.payee(first) == 'WHOLE FOODS MARKET #123'
+    assert Qif.normalized_payee(first) == 'WHOLE FOODS MARKET #123'
+    assert Qif.get_category(first) == 'Expenses:Food:Groceries'
+    assert Qif.get_category(second) is None
+
+
+def test_init_from_qif_file(tmp_path):
+    path = tmp_path / 'sample.qif'
+    path.write_text(QIF_DATA)
+
+    qif = Qif().init_from_qif_file(str(path))
+
+    assert qif.account() == 'Assets:Checking'
+    assert len(qif.transactions) == 2
+
+
+def test_iter_transactions_builds_splits():
+    qif = Qif().init_from_qif_data(QIF_DATA.splitlines())
+    accounts = {
+        'Assets:Checking': SimpleNamespace(id=1),
+        'Expenses:Food:Groceries': SimpleNamespace(id=2),
+    }
+
+    transactions = qif.iter_transactions(7, accounts.get)
+
+    assert isinstance(transactions, Iterator)
+    txn = next(transactions)
+    assert txn.book_id == 7
+    assert txn.transaction_date == date(2024, 1, 15)
+    assert txn.payee_norm == 'WHOLE FOODS MARKET #123'
+    assert [(s.account_id, s.amount_e4) for s in txn.splits] == [(1, -456700), (2, 456700)]
+
+
+def test_iter_transactions_unresolved_account_raises():
+    qif = Qif().init_from_qif_data(QIF_DATA.splitlines())
+    accounts = {'Assets:Checking': SimpleNamespace(id=1)}
+
+    with pytest.raises(ValueError, match='Expenses:Food:Groceries'):
+        next(qif.iter_transactions(7, accounts.get))
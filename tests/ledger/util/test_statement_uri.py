@@ -52,6 +52,16 @@ class TestAccountUri:
         with pytest.raises(ValueError):
             AccountUri.from_string("2023/account/01-01-2023--01-31-2023-account")
 
+    def test_invalid_calendar_date_raises(self):
+        with pytest.raises(ValueError):
+            AccountUri.from_string("2023/account/2023-02-30--2023-03-31-account")
+
+    def test_equal_paths_compare_equal(self):
+        a = AccountUri.from_string("2023/account/2023-01-01--2023-01-31-account.pdf")
+        b = AccountUri.from_string("2023/account/2023-01-01--2023-01-31-account")
+        assert a == b
+        assert hash(a) == hash(b)
+
     def test_account_slug_mismatch_raises(self):
         with pytest.raises(ValueError):
             AccountUri.from_string("2023/account-a/2023-01-01--2023-01-31-account-b")